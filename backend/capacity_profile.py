@@ -0,0 +1,144 @@
+from typing import List
+
+class CapacityProfile:
+    """
+    Remaining Daily Capacity as a Segment Tree
+
+    Leaves are days; every node stores the min and max remaining capacity of
+    its range plus a pending range-add (no push-down needed: a node's true
+    value is its stored value plus the pending adds of its strict ancestors).
+    - reserve(start, end, workers): range add in O(log H).
+    - earliest_fit(day, duration, workers): first start >= day whose whole
+      window has `workers` free. Each probe jumps to the next day with enough
+      free capacity (max descent), then to just after the last blocked day
+      of its window (min descent), so whole busy stretches are skipped at
+      once and the cost depends on the conflicts crossed, not on days.
+    The horizon doubles on demand.
+    """
+
+    def __init__(self, capacity: int, horizon: int = 1024):
+        self.capacity = capacity
+        self._build([capacity] * max(1, horizon))
+
+    def _build(self, values: List[int]):
+        size = 1
+        while size < len(values):
+            size *= 2
+        values = values + [self.capacity] * (size - len(values))
+        self.size = size
+        self._min = [0] * size + values
+        self._max = [0] * size + values
+        self._add = [0] * (2 * size)
+        for node in range(size - 1, 0, -1):
+            self._min[node] = min(self._min[2 * node], self._min[2 * node + 1])
+            self._max[node] = max(self._max[2 * node], self._max[2 * node + 1])
+
+    def _grow(self, days: int):
+        if days <= self.size:
+            return
+        values = self.values(self.size)
+        while len(values) < days:
+            values = values + [self.capacity] * len(values)
+        self._build(values)
+
+    def values(self, days: int) -> List[int]:
+        """
+        Remaining capacity of days [0, days).
+        """
+        days = min(days, self.size)
+        out = []
+        stack = [(1, 0, self.size, 0)]
+        while stack:
+            node, low, high, pending = stack.pop()
+            if low >= days:
+                continue
+            if node >= self.size:
+                out.append(self._min[node] + pending)
+                continue
+            pending += self._add[node]
+            mid = (low + high) // 2
+            stack.append((2 * node + 1, mid, high, pending))
+            stack.append((2 * node, low, mid, pending))
+        return out
+
+    def reserve(self, start: int, end: int, workers: int):
+        """
+        Removes `workers` from every day in [start, end).
+        """
+        if end <= start:
+            return
+        self._grow(end)
+        low, high = start + self.size, end + self.size
+        left, right = low, high - 1
+        while low < high:
+            if low & 1:
+                self._apply(low, -workers)
+                low += 1
+            if high & 1:
+                high -= 1
+                self._apply(high, -workers)
+            low >>= 1
+            high >>= 1
+        self._pull(left)
+        self._pull(right)
+
+    def _apply(self, node: int, delta: int):
+        self._min[node] += delta
+        self._max[node] += delta
+        if node < self.size:
+            self._add[node] += delta
+
+    def _pull(self, node: int):
+        node >>= 1
+        while node:
+            add = self._add[node]
+            self._min[node] = min(self._min[2 * node], self._min[2 * node + 1]) + add
+            self._max[node] = max(self._max[2 * node], self._max[2 * node + 1]) + add
+            node >>= 1
+
+    def _first_at_least(self, start: int, workers: int) -> int:
+        """
+        First day >= start with at least `workers` free (the horizon end if none).
+        """
+        stack = [(1, 0, self.size, 0)]
+        while stack:
+            node, low, high, pending = stack.pop()
+            if high <= start or self._max[node] + pending < workers:
+                continue
+            if node >= self.size:
+                return low
+            pending += self._add[node]
+            mid = (low + high) // 2
+            stack.append((2 * node + 1, mid, high, pending))
+            stack.append((2 * node, low, mid, pending))
+        return self.size # Past the horizon every day is free
+
+    def _last_below(self, start: int, end: int, workers: int) -> int:
+        """
+        Last day in [start, end) whose remaining capacity is below `workers`,
+        or -1 if the whole window fits.
+        """
+        stack = [(1, 0, self.size, 0)]
+        while stack:
+            node, low, high, pending = stack.pop()
+            if high <= start or low >= end or self._min[node] + pending >= workers:
+                continue
+            if node >= self.size:
+                return low
+            pending += self._add[node]
+            mid = (low + high) // 2
+            stack.append((2 * node, low, mid, pending))
+            stack.append((2 * node + 1, mid, high, pending))
+        return -1
+
+    def earliest_fit(self, day: int, duration: int, workers: int) -> int:
+        if workers > self.capacity:
+            raise ValueError(f"A task needs {workers} workers but the shared capacity is {self.capacity}")
+        while True:
+            self._grow(day + 1)
+            day = self._first_at_least(day, workers)
+            self._grow(day + duration)
+            blocked = self._last_below(day, day + duration, workers)
+            if blocked == -1:
+                return day
+            day = blocked + 1 # No window containing that day can fit
@@ -0,0 +1,51 @@
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Iterable
+from pydantic import BaseModel
+
+def request_fingerprint(payload: BaseModel, exclude: Iterable[str] = ("api_key",)) -> str:
+    """
+    Canonical hash of a request body: sorted-key JSON of the model with
+    secrets (api_key) excluded, so requests differing only by key coalesce.
+    """
+    data = payload.model_dump(exclude=set(exclude))
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    """
+    Request Coalescing (Single-Flight)
+
+    Concurrent calls with the same key share one in-flight computation and all
+    receive its result (or exception). The computation runs as its own task,
+    so a disconnecting first caller does not cancel it for the others.
+    Keys are forgotten as soon as the computation finishes; this is
+    de-duplication of concurrent work, not a result cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.requests = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable]):
+        self.requests += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            future = asyncio.ensure_future(work())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _f: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -7,5 +7,25 @@ class Settings:
     PROJECT_NAME: str = "Constructive Builder Backend"
     VERSION: str = "1.0.0"
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    JOB_MAX_WORKERS: int = int(os.getenv("JOB_MAX_WORKERS", "2"))
+    JOB_MAX_PENDING: int = int(os.getenv("JOB_MAX_PENDING", "100"))
+    JOB_RETENTION_SECONDS: int = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+    SESSION_DEBOUNCE_SECONDS: float = float(os.getenv("SESSION_DEBOUNCE_SECONDS", "0.15"))
+    SESSION_SUMMARY_SETTLE_SECONDS: float = float(os.getenv("SESSION_SUMMARY_SETTLE_SECONDS", "2.0"))
+    SESSION_MAX_WAIT_SECONDS: float = float(os.getenv("SESSION_MAX_WAIT_SECONDS", "0.6")) # Debounce flush bound for continuous input
+    STUB_LLM_LATENCY_SECONDS: float = float(os.getenv("STUB_LLM_LATENCY_SECONDS", "0.05"))
+    BATCH_MAX_PROJECTS: int = int(os.getenv("BATCH_MAX_PROJECTS", "50"))
+    PIPELINE_MAX_WORKERS: int = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+    SENSITIVITY_MAX_EVALUATIONS: int = int(os.getenv("SENSITIVITY_MAX_EVALUATIONS", "2000000"))
+    # LLM orchestration: failover order, per-request budget, hedging and circuit breakers
+    LLM_PROVIDER_ORDER: str = os.getenv("LLM_PROVIDER_ORDER", "gemini,groq")
+    LLM_BUDGET_SECONDS: float = float(os.getenv("LLM_BUDGET_SECONDS", "20"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "15"))
+    LLM_HEDGE_DELAY_SECONDS: float = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "5"))
+    LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "3"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    LLM_PROMPT_MAX_TOKENS: int = int(os.getenv("LLM_PROMPT_MAX_TOKENS", "400"))
 
 settings = Settings()
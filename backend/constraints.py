@@ -1,5 +1,6 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from backend.models import ProjectInput
+from backend.work_calendar import WorkCalendar
 
 class ConstraintEngine:
     def check_feasibility(
@@ -7,13 +8,16 @@ class ConstraintEngine:
         schedule: Dict[str, Dict[str, int]], 
         total_cost: float, 
         project_input: ProjectInput,
-        tasks_dict: Dict  # Added to access task details for workforce check
+        tasks_dict: Dict,  # Added to access task details for workforce check
+        calendar: Optional[WorkCalendar] = None
     ) -> Dict:
         """
         Checks feasibility against constraints:
         1. Deadline
         2. Budget
         3. Workforce Cap (Daily)
+        With a calendar, schedule days are working days and the deadline is
+        compared in elapsed calendar days (weekends and holidays included).
         """
         issues = []
         suggestions = []
@@ -26,6 +30,8 @@ class ConstraintEngine:
         
         # 2. Deadline Check
         max_end_date = max((t['end'] for t in schedule.values()), default=0)
+        if calendar is not None:
+            max_end_date = int(calendar.finish_offset(max_end_date))
         if max_end_date > project_input.deadline:
             delay = max_end_date - project_input.deadline
             issues.append(f"Deadline exceeded by {delay} days.")
@@ -14,6 +14,13 @@ class CostEngine:
     MATERIAL_COEFFICIENT = 500
     OVERHEAD_PERCENTAGE = 0.10
 
+    def calculate_material_cost(self, project_input: ProjectInput) -> float:
+        return (
+            project_input.area
+            * project_input.floors
+            * self.MATERIAL_COEFFICIENT
+        )
+
     def calculate_total_cost(
         self,
         schedule: Dict[str, Dict[str, int]],
@@ -30,11 +37,7 @@ class CostEngine:
                 task_cost = duration * task.cost_per_day
                 total_labor_cost += task_cost
 
-        material_cost = (
-            project_input.area
-            * project_input.floors
-            * self.MATERIAL_COEFFICIENT
-        )
+        material_cost = self.calculate_material_cost(project_input)
 
         overhead_cost = (
             total_labor_cost + material_cost
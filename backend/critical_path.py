@@ -1,9 +1,12 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+import numpy as np
+from backend.network import TaskNetwork
 
 class CriticalPathAnalyzer:
-    def __init__(self, schedule: Dict[str, Dict[str, int]], tasks):
+    def __init__(self, schedule: Dict[str, Dict[str, int]], tasks, network: Optional[TaskNetwork] = None):
         self.schedule = schedule
         self.tasks = tasks
+        self.network = network
 
     def identify_critical_path(self) -> Dict:
         """
@@ -13,8 +16,6 @@ class CriticalPathAnalyzer:
             - critical_path: List[str] (Task IDs on the critical path)
             - task_analytics: Dict[str, Dict] (ES, EF, LS, LF, Slack per task)
         """
-        import networkx as nx
-
         # 1. Get Project Duration from Schedule
         if not self.schedule:
             return {"critical_path": [], "task_analytics": {}}
@@ -23,53 +24,26 @@ class CriticalPathAnalyzer:
         project_duration = max((t['end'] for t in self.schedule.values()), default=0)
 
         # 2. Backward Pass (Late Start / Late Finish)
-        late_finish = {node: project_duration for node in self.schedule.keys()}
-        late_start = {node: 0 for node in self.schedule.keys()}
-        
-        # Helper to get task duration consistent with Forward Pass
-        def get_duration(task_id):
-            return self.schedule[task_id]['end'] - self.schedule[task_id]['start']
-
-        # Traverse in Reverse Topological Order
+        # Reuse the compiled network when the Scheduler provides one; otherwise
+        # compile a single-floor network from the task list.
         try:
-            # Re-build simple graph if not provided (though it should be passed)
-            # Assuming self.tasks contains dependencies to build graph structure if needed
-            # But the 'tasks' argument in init was list of generic objects.
-            # Let's rely on the structure implicit in the schedule + dependencies from self.tasks
-            
-            # Better: We need the graph. Re-verify Scheduler passed tasks properly.
-            # We'll rebuild a local lightweight graph for topological sort
-            G = nx.DiGraph()
-            task_map = {t.id: t for t in self.tasks}
-            for t_id in self.schedule.keys():
-                G.add_node(t_id)
-                if t_id in task_map:
-                    for dep in task_map[t_id].dependencies:
-                        if dep in self.schedule: # Only add if dependency exists in schedule
-                            G.add_edge(dep, t_id)
-
-            reverse_order = list(reversed(list(nx.topological_sort(G))))
-
-            for task_id in reverse_order:
-                # LF is min(LS) of successors
-                successors = list(G.successors(task_id))
-                
-                if successors:
-                    lf = min(late_start[s] for s in successors)
-                else:
-                    # If no successors, it connects to end of project
-                    lf = project_duration
-                
-                duration = get_duration(task_id)
-                ls = lf - duration
-                
-                late_finish[task_id] = lf
-                late_start[task_id] = ls
-
-        except nx.NetworkXUnfeasible:
+            network = self.network or TaskNetwork([t for t in self.tasks if t.id in self.schedule])
+        except ValueError:
             # Should receive DAG, but safety first
             return {"critical_path": [], "task_analytics": {}}
 
+        # Durations consistent with Forward Pass
+        instance_ids = network.instance_ids
+        if set(instance_ids) != set(self.schedule.keys()):
+            return {"critical_path": [], "task_analytics": {}}
+        durations = np.array(
+            [self.schedule[t]['end'] - self.schedule[t]['start'] for t in instance_ids],
+            dtype=np.int64
+        )
+        late_finish_arr = network.backward_pass(durations, project_duration)
+        late_finish = dict(zip(instance_ids, late_finish_arr.tolist()))
+        late_start = {t: late_finish[t] - int(d) for t, d in zip(instance_ids, durations)}
+
         # 3. Calculate Slack & Identify Critical Path
         critical_path = []
         task_analytics = {}
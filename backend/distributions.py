@@ -0,0 +1,178 @@
+from typing import Dict, Optional
+import numpy as np
+from scipy.special import betaincinv, ndtr
+from backend.models import DurationDistribution
+from backend.network import TaskNetwork
+
+DEFAULT_DISTRIBUTION = DurationDistribution()
+SUPPORTED_KINDS = {"uniform", "triangular", "pert", "lognormal", "empirical"}
+CLOSED_FORM_KINDS = ("uniform", "triangular", "pert", "lognormal")
+
+def validate_distribution(spec: DurationDistribution):
+    if spec.kind not in SUPPORTED_KINDS:
+        raise ValueError(f"Unsupported duration distribution: {spec.kind}")
+    if spec.kind == "empirical":
+        if not spec.samples or min(spec.samples) <= 0:
+            raise ValueError("Empirical distributions need positive sample multipliers")
+    elif spec.kind == "lognormal":
+        if spec.mode <= 0 or spec.sigma < 0:
+            raise ValueError("Lognormal distributions need mode > 0 and sigma >= 0")
+    else:
+        if not 0 < spec.low <= spec.mode <= spec.high:
+            raise ValueError(f"{spec.kind} distributions need 0 < low <= mode <= high")
+        if spec.kind != "uniform" and spec.low == spec.high:
+            raise ValueError(f"{spec.kind} distributions need low < high")
+
+class DurationSampler:
+    """
+    Vectorized Duration Multiplier Sampler
+
+    Each task carries its own distribution (default uniform 0.85-1.15). Slots
+    are grouped by distribution kind so every batch costs one vectorized call
+    per kind (per task for empirical). Multipliers come from each kind's exact
+    inverse CDF (PERT: scipy's betaincinv); independent PERT slots skip the
+    slow inverse and draw from NumPy's beta sampler instead.
+
+    Correlation uses a Gaussian copula: tasks sharing a `correlation_group`
+    get an equicorrelated template-level correlation matrix whose Cholesky
+    factor is computed once here. Each floor draws an independent correlated
+    vector, so e.g. weather hits every outdoor task of a floor together.
+    """
+
+    def __init__(self, network: TaskNetwork, correlation_groups: Optional[Dict[str, float]] = None):
+        correlation_groups = correlation_groups or {}
+        self.size = network.size
+        template_ids = network.template_ids
+        specs = [network.templates[t].duration_distribution or DEFAULT_DISTRIBUTION for t in template_ids]
+        for spec in specs:
+            validate_distribution(spec)
+
+        # Slot -> template index / floor lookup (slots of a template are contiguous)
+        slots_per_template = np.array([network.slots[t] for t in template_ids])
+        self._slot_template = np.repeat(np.arange(len(template_ids)), slots_per_template)
+        starts = np.repeat(np.array([network.offsets[t] for t in template_ids]), slots_per_template)
+        slot_floor = np.arange(self.size) - starts
+
+        # Fast path: the historical independent uniform(0.85, 1.15) model
+        self._all_default = all(spec == DEFAULT_DISTRIBUTION for spec in specs)
+
+        # Closed-form kinds: one vectorized expression over all their slots
+        self._closed_form: Dict[str, tuple] = {}
+        for kind in CLOSED_FORM_KINDS:
+            members = [i for i, spec in enumerate(specs) if spec.kind == kind]
+            if not members:
+                continue
+            slots = np.flatnonzero(np.isin(self._slot_template, members))
+            params = {
+                name: np.array([getattr(specs[i], name) for i in self._slot_template[slots]])[:, None]
+                for name in ("low", "mode", "high", "sigma")
+            }
+            if kind == "pert":
+                span = params["high"] - params["low"]
+                params["alpha"] = 1 + 4 * (params["mode"] - params["low"]) / span
+                params["beta"] = 1 + 4 * (params["high"] - params["mode"]) / span
+            self._closed_form[kind] = (slots, params)
+
+        # Empirical: piecewise-linear inverse CDF through the sorted samples
+        self._empirical = []
+        for i, spec in enumerate(specs):
+            if spec.kind == "empirical":
+                values = np.sort(np.asarray(spec.samples, dtype=float))
+                probabilities = (np.arange(len(values)) + 0.5) / len(values)
+                self._empirical.append((np.flatnonzero(self._slot_template == i), probabilities, values))
+
+        # Gaussian copula: template-level correlation matrix over the templates
+        # that actually share a group; the rest draw independently
+        groups = [network.templates[t].correlation_group for t in template_ids]
+        correlation = np.eye(len(template_ids))
+        for i, group_i in enumerate(groups):
+            for j, group_j in enumerate(groups):
+                if i != j and group_i is not None and group_i == group_j:
+                    rho = correlation_groups.get(group_i, 0.0)
+                    if not 0.0 <= rho < 1.0:
+                        raise ValueError(f"Correlation for group '{group_i}' must be in [0, 1)")
+                    correlation[i, j] = rho
+        correlated = np.flatnonzero((correlation != np.eye(len(template_ids))).any(axis=1))
+        self.cholesky = None
+        if len(correlated):
+            self.cholesky = np.linalg.cholesky(correlation[np.ix_(correlated, correlated)])
+
+        # Latent draw layout: copula slots take Phi(z) (or z itself for
+        # lognormal), independent slots draw uniforms / normals directly and
+        # independent PERT slots draw betas
+        is_lognormal = np.isin(self._slot_template, [i for i, s in enumerate(specs) if s.kind == "lognormal"])
+        is_pert = np.isin(self._slot_template, [i for i, s in enumerate(specs) if s.kind == "pert"])
+        in_copula = np.isin(self._slot_template, correlated)
+        copula_slots = np.flatnonzero(in_copula)
+        local = np.searchsorted(correlated, self._slot_template[copula_slots])
+        self._copula_draws = (len(correlated), network.floors) # Normals per run: templates x floors
+        self._copula_index = (local, slot_floor[copula_slots])
+        self._copula_u = (np.flatnonzero(~is_lognormal[in_copula]), copula_slots[~is_lognormal[in_copula]])
+        self._copula_z = (np.flatnonzero(is_lognormal[in_copula]), copula_slots[is_lognormal[in_copula]])
+        self._free_u = np.flatnonzero(~in_copula & ~is_lognormal & ~is_pert)
+        self._free_z = np.flatnonzero(~in_copula & is_lognormal)
+        self._pert_in_copula = in_copula[is_pert] # Per PERT slot, in slot order
+        self.lognormal_slots = is_lognormal
+
+    def sample(self, rng: np.random.Generator, runs: int) -> np.ndarray:
+        """
+        Returns a (slots x runs) matrix of duration multipliers.
+        """
+        if self._all_default and self.cholesky is None:
+            return rng.uniform(DEFAULT_DISTRIBUTION.low, DEFAULT_DISTRIBUTION.high, size=(self.size, runs))
+
+        u = np.empty((self.size, runs))
+        z = np.empty((self.size, runs))
+        u[self._free_u] = rng.random((len(self._free_u), runs))
+        z[self._free_z] = rng.standard_normal((len(self._free_z), runs))
+        if self.cholesky is not None:
+            # Correlated normals per floor: L @ E with E ~ N(0, I), gathered per slot
+            templates, floors = self._copula_draws
+            independent = rng.standard_normal((templates, floors * runs))
+            latent = (self.cholesky @ independent).reshape(templates, floors, runs)[self._copula_index]
+            rows, slots = self._copula_u
+            u[slots] = ndtr(latent[rows])
+            rows, slots = self._copula_z
+            z[slots] = latent[rows]
+
+        multipliers = self._inverse_cdf(u, z, self._pert_in_copula)
+        if "pert" in self._closed_form:
+            slots, p = self._closed_form["pert"]
+            free = ~self._pert_in_copula
+            betas = rng.beta(p["alpha"][free], p["beta"][free], size=(int(free.sum()), runs))
+            multipliers[slots[free]] = p["low"][free] + (p["high"] - p["low"])[free] * betas
+        return multipliers
+
+    def transform(self, u: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Maps latent draws to multipliers: uniforms `u` for every slot except
+        `lognormal_slots`, which read standard normals from `z` (both
+        slots x runs). Lets callers supply their own designs.
+        """
+        return self._inverse_cdf(u, z, np.ones(len(self._pert_in_copula), dtype=bool))
+
+    def _inverse_cdf(self, u: np.ndarray, z: np.ndarray, pert_rows: np.ndarray) -> np.ndarray:
+        """
+        Multipliers of every slot except the PERT slots not selected by the
+        `pert_rows` mask, which are left for the caller.
+        """
+        multipliers = np.empty(u.shape)
+        for kind, (slots, p) in self._closed_form.items():
+            if kind == "uniform":
+                multipliers[slots] = p["low"] + (p["high"] - p["low"]) * u[slots]
+            elif kind == "triangular":
+                us = u[slots]
+                span = p["high"] - p["low"]
+                left = p["low"] + np.sqrt(us * span * (p["mode"] - p["low"]))
+                right = p["high"] - np.sqrt((1 - us) * span * (p["high"] - p["mode"]))
+                multipliers[slots] = np.where(us < (p["mode"] - p["low"]) / span, left, right)
+            elif kind == "pert":
+                if pert_rows.any():
+                    betas = betaincinv(p["alpha"][pert_rows], p["beta"][pert_rows], u[slots[pert_rows]])
+                    multipliers[slots[pert_rows]] = p["low"][pert_rows] + (p["high"] - p["low"])[pert_rows] * betas
+            else:
+                multipliers[slots] = p["mode"] * np.exp(p["sigma"] * z[slots])
+
+        for slots, probabilities, values in self._empirical:
+            multipliers[slots] = np.interp(u[slots], probabilities, values)
+        return multipliers
@@ -1,13 +1,17 @@
 from backend.llm_factory import BaseLLMService
 from typing import Dict
-import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from backend.config import settings
 
 class GeminiService(BaseLLMService):
+    MODEL = "models/gemini-2.0-flash-lite"
+
     def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-lite')
+        # Per-instance client: genai.configure() would set the key process-wide,
+        # so concurrent requests with different keys could use each other's
+        self.client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
 
-    def generate_summary(self, project_data: Dict) -> str:
+    def generate_summary(self, project_data: Dict, context: str) -> str:
         # CONSTRUCT THE HIGH-LEVEL STRATEGIC PROMPT
         prompt = f"""
         You are Constructive Builder, an Autonomous Constraint-Aware Construction Optimization Engine.
@@ -21,7 +25,7 @@ class GeminiService(BaseLLMService):
         5. Provide a Strategic Executive Summary for investors/clients.
 
         INPUT DATA:
-        {project_data}
+        {context}
 
         OUTPUT FORMAT (Strict Markdown):
         
@@ -51,72 +55,10 @@ class GeminiService(BaseLLMService):
         TONE: Authoritative, Precision-Engineered, Forward-Looking.
         """
         
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            error_str = str(e)
-            # FALLBACK: HIGH-FIDELITY SIMULATION MODE
-            if "429" in error_str or "quota" in error_str.lower():
-                return self._generate_simulated_response(project_data)
-
-            # For other errors, try to return useful info
-            return f"Error: {str(e)}"
-
-    def _generate_simulated_response(self, data: Dict) -> str:
-        """
-        Generates a deterministic but high-quality strategic report when LLM is unavailable.
-        """
-        feasibility = data.get("feasibility", {})
-        is_feasible = feasibility.get("feasible", False)
-        issues = feasibility.get("issues", [])
-        
-        duration = data.get("duration", 0)
-        cost = data.get("cost_breakdown", {}).get("total_cost", 0)
-        risk_p80 = data.get("risks", {}).get("p80_duration", 0)
-        
-        verdict = "**Feasible**" if is_feasible else "**Infeasible**"
-        if not is_feasible and len(issues) < 2:
-           verdict = "**Conditionally Feasible** (Requires Minor Adjustments)"
-        if not is_feasible and len(issues) >= 2:
-           verdict = "**Infeasible** (Major Constraints Violated)"
-
-        # 2. Constraints
-        deadline_status = "On Track"
-        budget_status = "Within Limit" 
-        workforce_status = "Optimized"
-        
-        for issue in issues:
-            if "Deadline" in issue: deadline_status = f"CRITICAL: {issue}"
-            if "Budget" in issue: budget_status = f"OVERRUN: {issue}"
-            if "Workforce" in issue: workforce_status = f"BOTTLENECK: {issue}"
-
-        return f"""## 1. Feasibility Verdict
-**Verdict:** {verdict}
-
-**Justification:** 
-The proposed plan has been rigorously analyzed against {len(data.get('cost_breakdown', {}))} cost drivers and {len(data.get('critical_path', []))} critical path tasks. 
-Current deterministic duration is **{duration} days** against a P80 risk-adjusted forecast of **{risk_p80:.1f} days**.
-
-## 2. Constraint Violations & Critical Gaps
-*   **Deadline Integrity:** {deadline_status}
-*   **Budget Health:** {budget_status}
-*   **Workforce Efficiency:** {workforce_status}
-*   **Risk Profile:** P80 Confidence Interval indicates a variance of +{(risk_p80 - duration):.1f} days.
-
-## 3. Strategic Optimization Recommendations
-1.  **Critical Path Crashing:** Fast-track **Foundation Laying** and **Superstructure** phases. Increasing workforce by 15% here could recover ~{int(duration * 0.1)} days.
-2.  **Resource Leveling:** Peak workforce demand correlates with **Internal Plastering**. Smooth this peak to avoid day-to-day labor shortages.
-3.  **Procurement Strategy:** Pre-order high-volatility materials (Steel/Cement) now to hedge against the projected 10% market variance.
-
-## 4. Risk Simulation Insight
-*   **Scenario A (Material Cost +10%):** Project budget would face an additional deficit of ~{(cost * 0.4 * 0.1):,.2f}.
-*   **Scenario B (Labor Efficiency -15%):** Completion date would slip by approx {int(duration * 0.15)} days, pushing project into penalty zone.
-*   **Scenario C (Critical Path Failure):** A delay in **{data.get('critical_path', ['Foundation'])[0]}** has a 1:1 impact on the final handover.
-
-## 5. Strategic Executive Summary
-Constructive Builder has performed a comprehensive multi-variable analysis of your project parameters.
-While the baseline plan presents challenges, specifically regarding **{issues[0] if issues else "minor logical constraints"}**, the algorithmic model suggests that targeted interventions in workforce allocation and parallel scheduling can stabilize the trajectory. 
-
-**Recommendation:** Proceed to **Detailed Engineering Phase** with immediate focus on resolving the identified constraint bottlenecks.
-"""
+        # Failures (quota, timeouts, ...) raise; the orchestrator fails over
+        response = self.client.generate_content(
+            model=self.MODEL,
+            contents=[glm.Content(parts=[glm.Part(text=prompt)])],
+            timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+        return "".join(part.text for part in response.candidates[0].content.parts)
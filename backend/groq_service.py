@@ -1,21 +1,24 @@
 from backend.llm_factory import BaseLLMService
 from typing import Dict
 from openai import OpenAI
+from backend.config import settings
 
 class GroqService(BaseLLMService):
     def __init__(self, api_key: str):
         self.client = OpenAI(
             base_url="https://api.groq.com/openai/v1",
-            api_key=api_key
+            api_key=api_key,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=0 # Failover between providers is handled by the orchestrator
         )
         self.model = "llama-3.3-70b-versatile"
 
-    def generate_summary(self, project_data: Dict) -> str:
+    def generate_summary(self, project_data: Dict, context: str) -> str:
         prompt = f"""
         You are a construction project management expert. Analyze the following project data and provide an executive summary.
         
         Project Data:
-        {project_data}
+        {context}
         
         Your summary should include:
         1. Feasibility Assessment
@@ -24,14 +27,15 @@ class GroqService(BaseLLMService):
         
         Keep it professional, concise, and actionable.
         """
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful construction project assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"Error generating summary with Groq: {str(e)}"
+        # Failures raise; the orchestrator fails over
+        response = self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a helpful construction project assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            model=self.model,
+        )
+        content = response.choices[0].message.content
+        if not content:
+            raise RuntimeError("Groq returned an empty summary")
+        return content
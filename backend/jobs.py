@@ -0,0 +1,141 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from backend.models import JobInfo
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    pass
+
+class JobQueueFull(Exception):
+    pass
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def report_progress(self, done: int, total: int):
+        """
+        Progress hook handed to long-running work (e.g. RiskSimulator's
+        progress_callback). Raises JobCancelled once cancellation is requested,
+        which aborts the work at the next batch boundary.
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        self.progress = done / total if total else 1.0
+
+    def info(self, retention: timedelta) -> JobInfo:
+        return JobInfo(
+            job_id=self.id,
+            kind=self.kind,
+            status=self.status,
+            progress=round(self.progress, 4),
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            expires_at=self.finished_at + retention if self.finished_at else None,
+            error=self.error
+        )
+
+class JobManager:
+    """
+    In-process background job queue (no external broker).
+
+    - Bounded concurrency: a fixed-size thread pool runs at most `max_workers`
+      jobs; at most `max_pending` jobs may be queued or running.
+    - Cancellation: queued jobs are dropped, running jobs stop cooperatively
+      at their next progress report.
+    - Retention: finished jobs (and their results) expire after
+      `retention_seconds`; expired jobs are purged lazily on access.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 100, retention_seconds: int = 3600):
+        self.retention = timedelta(seconds=retention_seconds)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, work: Callable[[Job], Any]) -> Job:
+        """
+        Queues `work(job)`; the callable should report progress through
+        `job.report_progress` and return the job result.
+        """
+        self._purge_expired()
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status in (QUEUED, RUNNING))
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({pending} pending jobs)")
+            job = Job(kind)
+            # Publish only once the future exists, so cancel() always finds it
+            job.future = self._executor.submit(self._run, job, work)
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job._cancel_event.set()
+        if job.status == QUEUED and job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, work: Callable[[Job], Any]):
+        if job._cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        try:
+            result = work(job)
+            if job._cancel_event.is_set(): # Cancelled after the last progress report
+                raise JobCancelled()
+            job.result = result
+            job.progress = 1.0
+            self._finish(job, COMPLETED)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = getattr(e, "detail", None) or str(e)
+            self._finish(job, FAILED)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = datetime.now(timezone.utc)
+
+    def _purge_expired(self):
+        cutoff = datetime.now(timezone.utc) - self.retention
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -3,10 +3,16 @@ from typing import Dict, Optional
 
 class BaseLLMService(ABC):
     @abstractmethod
-    def generate_summary(self, project_data: Dict) -> str:
+    def generate_summary(self, project_data: Dict, context: str) -> str:
+        """
+        `context` is the compact prompt summary of `project_data`, built once
+        per request by the orchestrator and shared by every attempt.
+        """
         pass
 
 class LLMFactory:
+    PROVIDERS = ("gemini", "groq", "stub")
+
     @staticmethod
     def get_service(provider: str, api_key: str):
         if provider.lower() == "gemini":
@@ -15,5 +21,8 @@ class LLMFactory:
         elif provider.lower() == "groq":
             from backend.groq_service import GroqService
             return GroqService(api_key)
+        elif provider.lower() == "stub":
+            from backend.stub_service import StubService
+            return StubService(api_key)
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
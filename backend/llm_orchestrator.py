@@ -0,0 +1,252 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from backend.llm_factory import BaseLLMService, LLMFactory
+from backend.offline_report import generate_offline_report
+from backend.prompt_builder import build_prompt_context
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    provider is skipped without a call. Once `reset_seconds` have passed a
+    single trial call is let through (half-open): success closes the circuit,
+    failure re-opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+class ProviderStats:
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0 # Circuit open
+        self.hedged = 0 # Attempts started while another provider was still pending
+        self.wins = 0 # Attempts whose answer was returned to the caller
+        self.total_latency = 0.0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self, state: str) -> Dict:
+        completed = self.successes + self.failures
+        return {
+            "state": state,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "hedged": self.hedged,
+            "wins": self.wins,
+            "avg_latency_ms": round(self.total_latency / completed * 1000, 1) if completed else None,
+            "last_error": self.last_error,
+        }
+
+class LLMOrchestrator:
+    """
+    Multi-Provider LLM Orchestration
+
+    - Ordered failover: the requested provider first, then the configured
+      order (providers without an API key are left out).
+    - Latency budget: the whole call, failover included, is bounded by
+      `budget_seconds`; providers still pending at the deadline count as
+      timeouts and the offline report is returned instead.
+    - Hedging: if a provider has not answered after `hedge_delay_seconds`,
+      the next one is started in parallel and the first success wins.
+    - Circuit breakers skip providers that keep failing.
+    - Only `known_providers` (default: those LLMFactory can build) get a
+      breaker and stats; other requested names are counted as rejected and
+      skipped, so client input cannot grow the per-provider state.
+    Provider calls run on a bounded thread pool; a losing or timed-out call
+    finishes in the background and still updates its provider's health.
+    """
+
+    def __init__(
+        self,
+        provider_order: List[str],
+        api_keys: Optional[Dict[str, str]] = None,
+        budget_seconds: float = 20.0,
+        hedge_delay_seconds: float = 5.0,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30.0,
+        max_concurrency: int = 16,
+        prompt_max_tokens: int = 400,
+        service_factory: Callable[[str, str], BaseLLMService] = LLMFactory.get_service,
+        known_providers: Optional[List[str]] = None
+    ):
+        self.known_providers = {p.lower() for p in (known_providers or LLMFactory.PROVIDERS)}
+        self.provider_order = [
+            p.strip().lower() for p in provider_order if p.strip().lower() in self.known_providers
+        ]
+        self.api_keys = {k.lower(): v for k, v in (api_keys or {}).items()}
+        self.budget_seconds = budget_seconds
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.prompt_max_tokens = prompt_max_tokens
+        self.service_factory = service_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+        self.rejected = 0 # Requests naming an unknown provider
+
+    def _provider(self, name: str) -> Tuple[CircuitBreaker, ProviderStats]:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+                self._stats[name] = ProviderStats()
+            return self._breakers[name], self._stats[name]
+
+    def candidates(self, provider: str, api_key: str) -> List[Tuple[str, str]]:
+        """
+        (provider, api_key) pairs in failover order; an unknown requested
+        provider is dropped (and counted) before any state is created for it.
+        """
+        provider = provider.lower() if isinstance(provider, str) else ""
+        ordered = []
+        if provider in self.known_providers:
+            ordered.append((provider, api_key))
+        else:
+            with self._lock:
+                self.rejected += 1
+        for name in self.provider_order:
+            if name != provider and self.api_keys.get(name):
+                ordered.append((name, self.api_keys[name]))
+        return ordered
+
+    def generate_summary(self, project_data: Dict, provider: str, api_key: str) -> str:
+        deadline = time.monotonic() + self.budget_seconds
+        queue = self.candidates(provider, api_key)
+        pending: Dict[Future, str] = {}
+        claimed = set() # Futures whose breaker outcome has been recorded (first claim wins)
+        # Built (and recorded in prompt_stats) once, shared by hedged and failover attempts
+        context = build_prompt_context(project_data, max_tokens=self.prompt_max_tokens)
+
+        def call(name: str, key: str) -> str:
+            return self.service_factory(name, key).generate_summary(project_data, context)
+
+        def start_next() -> bool:
+            while queue:
+                name, key = queue.pop(0)
+                breaker, stats = self._provider(name)
+                if not breaker.allow():
+                    with self._lock:
+                        stats.skipped += 1
+                    continue
+                with self._lock:
+                    stats.attempts += 1
+                    if pending:
+                        stats.hedged += 1
+                future = self._executor.submit(call, name, key)
+                future.add_done_callback(self._recorder(name, time.monotonic(), claimed))
+                pending[future] = name
+                return True
+            return False
+
+        start_next()
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(self.hedge_delay_seconds, remaining) if queue else remaining
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                start_next() # Hedge: slow provider, race the next one
+                continue
+            for future in done:
+                name = pending.pop(future)
+                if future.exception() is None:
+                    with self._lock:
+                        self._stats[name].wins += 1
+                    return future.result()
+            if not pending:
+                start_next() # Failover: every in-flight attempt failed
+
+        # Budget exhausted or no provider left
+        for future, name in pending.items():
+            with self._lock:
+                if future in claimed:
+                    continue # Finished meanwhile; its callback recorded the outcome
+                claimed.add(future)
+                self._stats[name].timeouts += 1
+            self._breakers[name].record_failure()
+        with self._lock:
+            self.fallbacks += 1
+        return generate_offline_report(project_data)
+
+    def _recorder(self, name: str, started: float, claimed: set):
+        breaker, stats = self._provider(name)
+
+        def record(future: Future):
+            latency = time.monotonic() - started
+            error = future.exception()
+            with self._lock:
+                stats.total_latency += latency
+                if error is None:
+                    stats.successes += 1
+                else:
+                    stats.failures += 1
+                    stats.last_error = f"{type(error).__name__}: {error}"[:200]
+                if future in claimed:
+                    return # Already counted against the breaker as a timeout
+                claimed.add(future)
+            if error is None:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        return record
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            names = list(self._stats)
+        return {
+            "providers": {name: self._stats[name].as_dict(self._breakers[name].state) for name in names},
+            "fallbacks": self.fallbacks,
+            "rejected_providers": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
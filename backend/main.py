@@ -1,10 +1,33 @@
-from fastapi import FastAPI, HTTPException
-from backend.models import ProjectInput, ProjectAnalysisResponse, ConstructionTask
+import asyncio
+from datetime import timedelta
+from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List
+from backend.models import (
+    ProjectInput, ProjectAnalysisResponse, ConstructionTask, JobRequest, JobInfo,
+    BatchAnalysisRequest, BatchAnalysisItem, BatchAnalysisResponse, LevelingResult,
+    PortfolioRequest, PortfolioResult, SimulationExportRequest, SolveRequest, SolveResult,
+    SensitivityRequest, SensitivityResult
+)
 from backend.scheduler import Scheduler
 from backend.cost_engine import CostEngine
 from backend.constraints import ConstraintEngine
 from backend.simulation import RiskSimulator
-from backend.gemini_service import GeminiService
+from backend.work_calendar import WorkCalendar
+from backend.network import TaskNetwork
+from backend.leveling import ResourceLeveler
+from backend.critical_path import CriticalPathAnalyzer
+from backend.pipeline import AnalysisPipeline, Stage
+from backend.portfolio import PortfolioScheduler
+from backend.solver import GoalSolver
+from backend.sensitivity import SobolAnalyzer
+from backend.sample_export import export_columns, export_batch_size, stream_csv, stream_npy
+from backend.jobs import Job, JobManager, JobQueueFull, COMPLETED
+from backend.coalescing import SingleFlight, request_fingerprint
+from backend.session import PlanningSession, serve_session
+from backend.llm_orchestrator import LLMOrchestrator
+from backend.prompt_builder import prompt_stats
 from backend.config import settings
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,7 +44,32 @@ app.add_middleware(
 )
 
 # Initialize services
-# gemini_service = GeminiService() # Removed: Using LLMFactory per request
+job_manager = JobManager(
+    max_workers=settings.JOB_MAX_WORKERS,
+    max_pending=settings.JOB_MAX_PENDING,
+    retention_seconds=settings.JOB_RETENTION_SECONDS
+)
+
+# Identical concurrent /analyze_project payloads share one pipeline run
+analysis_flight = SingleFlight()
+
+# LLM calls: ordered failover, latency budget, hedging and per-provider circuit breakers
+llm_orchestrator = LLMOrchestrator(
+    provider_order=settings.LLM_PROVIDER_ORDER.split(","),
+    api_keys={"gemini": settings.GEMINI_API_KEY, "groq": settings.GROQ_API_KEY},
+    budget_seconds=settings.LLM_BUDGET_SECONDS,
+    hedge_delay_seconds=settings.LLM_HEDGE_DELAY_SECONDS,
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    prompt_max_tokens=settings.LLM_PROMPT_MAX_TOKENS
+)
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    job_manager.shutdown()
+    llm_orchestrator.shutdown()
+    analysis_pipeline.shutdown()
 
 # Placeholder tasks (as per requirement to define 15 tasks)
 # In a real app, these might come from a DB or be passed in the request.
@@ -31,92 +79,414 @@ DEFAULT_TASKS = [
     ConstructionTask(id="T2", name="Excavation", base_duration_per_sqyard=0.01, required_workers=6, cost_per_day=700, dependencies=["T1"]),
     ConstructionTask(id="T3", name="Foundation Laying", base_duration_per_sqyard=0.02, required_workers=10, cost_per_day=1200, dependencies=["T2"]),
     ConstructionTask(id="T4", name="Plinth Beam & Slab", base_duration_per_sqyard=0.015, required_workers=12, cost_per_day=1400, dependencies=["T3"]),
-    ConstructionTask(id="T5", name="Superstructure (Brickwork)", base_duration_per_sqyard=0.03, required_workers=15, cost_per_day=1800, dependencies=["T4"]),
-    ConstructionTask(id="T6", name="Roof Slab Casting", base_duration_per_sqyard=0.01, required_workers=20, cost_per_day=2500, dependencies=["T5"]),
-    ConstructionTask(id="T7", name="Door & Window Frames", base_duration_per_sqyard=0.008, required_workers=4, cost_per_day=500, dependencies=["T5"]),
-    ConstructionTask(id="T8", name="Electrical Conduit Fitting", base_duration_per_sqyard=0.005, required_workers=3, cost_per_day=450, dependencies=["T5"]),
-    ConstructionTask(id="T9", name="Plumbing Rough-ins", base_duration_per_sqyard=0.005, required_workers=3, cost_per_day=450, dependencies=["T5"]),
-    ConstructionTask(id="T10", name="Internal Plastering", base_duration_per_sqyard=0.015, required_workers=10, cost_per_day=1100, dependencies=["T6", "T7", "T8", "T9"]),
-    ConstructionTask(id="T11", name="External Plastering", base_duration_per_sqyard=0.015, required_workers=10, cost_per_day=1200, dependencies=["T6"]),
-    ConstructionTask(id="T12", name="Flooring & Tiling", base_duration_per_sqyard=0.02, required_workers=8, cost_per_day=1000, dependencies=["T10"]),
-    ConstructionTask(id="T13", name="Painting & Finishing", base_duration_per_sqyard=0.012, required_workers=6, cost_per_day=800, dependencies=["T11", "T12"]),
+    ConstructionTask(id="T5", name="Superstructure (Brickwork)", base_duration_per_sqyard=0.03, required_workers=15, cost_per_day=1800, dependencies=["T4"], repeat_per_floor=True, floor_dependencies=["T6"]),
+    ConstructionTask(id="T6", name="Roof Slab Casting", base_duration_per_sqyard=0.01, required_workers=20, cost_per_day=2500, dependencies=["T5"], repeat_per_floor=True),
+    ConstructionTask(id="T7", name="Door & Window Frames", base_duration_per_sqyard=0.008, required_workers=4, cost_per_day=500, dependencies=["T5"], repeat_per_floor=True),
+    ConstructionTask(id="T8", name="Electrical Conduit Fitting", base_duration_per_sqyard=0.005, required_workers=3, cost_per_day=450, dependencies=["T5"], repeat_per_floor=True),
+    ConstructionTask(id="T9", name="Plumbing Rough-ins", base_duration_per_sqyard=0.005, required_workers=3, cost_per_day=450, dependencies=["T5"], repeat_per_floor=True),
+    ConstructionTask(id="T10", name="Internal Plastering", base_duration_per_sqyard=0.015, required_workers=10, cost_per_day=1100, dependencies=["T6", "T7", "T8", "T9"], repeat_per_floor=True),
+    ConstructionTask(id="T11", name="External Plastering", base_duration_per_sqyard=0.015, required_workers=10, cost_per_day=1200, dependencies=["T6"], repeat_per_floor=True),
+    ConstructionTask(id="T12", name="Flooring & Tiling", base_duration_per_sqyard=0.02, required_workers=8, cost_per_day=1000, dependencies=["T10"], repeat_per_floor=True),
+    ConstructionTask(id="T13", name="Painting & Finishing", base_duration_per_sqyard=0.012, required_workers=6, cost_per_day=800, dependencies=["T11", "T12"], repeat_per_floor=True),
     ConstructionTask(id="T14", name="Electrical & Plumbing Fixtures", base_duration_per_sqyard=0.005, required_workers=4, cost_per_day=600, dependencies=["T13"]),
     ConstructionTask(id="T15", name="Site Cleanup & Handover", base_duration_per_sqyard=0.003, required_workers=3, cost_per_day=300, dependencies=["T14"]),
 ]
 
-@app.post("/analyze_project", response_model=ProjectAnalysisResponse)
-async def analyze_project(project_input: ProjectInput):
-    """
-    Analyzes the project feasibility, cost, schedule, and risks.
-    """
-    # 1. Scheduling
-    scheduler = Scheduler(DEFAULT_TASKS)
-    schedule = scheduler.calculate_schedule(project_input)
-    if not schedule:
+def get_project_tasks(project_input: ProjectInput) -> List[ConstructionTask]:
+    return project_input.tasks or DEFAULT_TASKS
+
+def build_project_data(project_input, total_duration, total_cost_estimate, feasibility, simulation_results, critical_path) -> dict:
+    return {
+        "input_parameters": project_input.model_dump(),
+        "duration": total_duration,
+        "cost_breakdown": total_cost_estimate.model_dump(),
+        "feasibility": feasibility,
+        # Chart data is not prompt material; no risks when the simulation stage is skipped
+        "risks": simulation_results.dict(exclude={"duration_histogram", "duration_cdf"}) if simulation_results else {},
+        "critical_path": critical_path
+    }
+
+def generate_executive_summary(project_input: ProjectInput, project_data: dict) -> str:
+    # Never raises: falls back to the offline report when no provider answers in budget
+    return llm_orchestrator.generate_summary(project_data, project_input.provider, project_input.api_key)
+
+# Analysis Pipeline: each stage declares the artifacts it consumes and produces.
+# Shared artifacts (network, durations, tasks_dict, schedule) are computed once;
+# critical path, cost and simulation only need the schedule and run concurrently.
+def network_stage(tasks, project_input):
+    try:
+        network = TaskNetwork.for_project(tasks, project_input)
+    except ValueError as e:
+        print(e) # Log error
         raise HTTPException(status_code=400, detail="Unable to calculate schedule (possible cycle)")
-    
-    total_duration = scheduler.get_total_duration(schedule)
-
-    # 2. Critical Path
-    from backend.critical_path import CriticalPathAnalyzer
-    cp_analyzer = CriticalPathAnalyzer(schedule, DEFAULT_TASKS) # tasks param is technically unused by updated CP logic but kept for sig match if needed, or better remove if clean
-    # Actually, my previous CP implementation doesn't use the second arg 'tasks' effectively, 
-    # but let's stick to the class init signature: __init__(self, schedule: Dict[str, Dict[str, int]], tasks)
-    cp_result = cp_analyzer.identify_critical_path()
-    critical_path = cp_result.get("critical_path", [])
-    task_analytics = cp_result.get("task_analytics", {})
-
-    # 3. Cost
-    # 3. Cost
-    cost_engine = CostEngine()
-    tasks_dict = {t.id: t for t in DEFAULT_TASKS}
-    total_cost_estimate = cost_engine.calculate_total_cost(
+    return {
+        "network": network,
+        "durations": network.base_durations(project_input.area),
+        "tasks_dict": network.task_map() # Per-floor instances map back to their template task
+    }
+
+def calendar_stage(project_input):
+    # Schedule days are working days when a calendar is enabled
+    try:
+        return {"calendar": WorkCalendar.for_project(project_input)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def schedule_stage(tasks, project_input, network, durations):
+    scheduler = Scheduler(tasks)
+    schedule = scheduler.calculate_schedule(project_input, network=network, durations=durations)
+    return {"schedule": schedule, "total_duration": scheduler.get_total_duration(schedule)}
+
+def critical_path_stage(schedule, tasks, network):
+    cp_result = CriticalPathAnalyzer(schedule, tasks, network=network).identify_critical_path()
+    return {
+        "critical_path": cp_result.get("critical_path", []),
+        "task_analytics": cp_result.get("task_analytics", {})
+    }
+
+def cost_stage(schedule, tasks_dict, project_input):
+    return {"cost_estimate": CostEngine().calculate_total_cost(schedule, tasks_dict, project_input)}
+
+def leveling_stage(schedule, network, task_analytics):
+    # Report how far slack alone lowers the workforce peak
+    return {"leveling": ResourceLeveler().level(schedule, network, task_analytics)}
+
+def constraints_stage(schedule, cost_estimate, project_input, tasks_dict, calendar, leveling):
+    feasibility = ConstraintEngine().check_feasibility(
         schedule,
+        cost_estimate.total_cost,
+        project_input,
         tasks_dict,
-        project_input
+        calendar=calendar
     )
-    total_cost = total_cost_estimate.total_cost 
+    if leveling is not None and leveling.peak_after < leveling.peak_before:
+        feasibility["suggestions"].append(
+            f"Shift {len(leveling.moved_tasks)} non-critical tasks within their slack to cut peak demand "
+            f"from {leveling.peak_before} to {leveling.peak_after} workers without extending the project."
+        )
+    return {"feasibility": feasibility}
 
-    # 4. Constraints
-    constraint_engine = ConstraintEngine()
-    feasibility = constraint_engine.check_feasibility(
-        schedule, 
-        total_cost, 
-        project_input,
-        tasks_dict
+def simulation_stage(tasks, project_input, network, durations, calendar):
+    try:
+        simulation_results = RiskSimulator().run_simulation(
+            tasks, project_input, network=network, calendar=calendar, base_durations=durations
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"simulation_results": simulation_results}
+
+def summary_stage(project_input, total_duration, cost_estimate, feasibility, simulation_results, critical_path):
+    project_data = build_project_data(
+        project_input, total_duration, cost_estimate, feasibility, simulation_results, critical_path or []
     )
+    return {"executive_summary": generate_executive_summary(project_input, project_data)}
 
-    # 5. Simulation
-    risk_simulator = RiskSimulator()
-    simulation_results = risk_simulator.run_simulation(DEFAULT_TASKS, project_input)
+analysis_pipeline = AnalysisPipeline([
+    Stage("network", ["tasks", "project_input"], ["network", "durations", "tasks_dict"], network_stage),
+    Stage("calendar", ["project_input"], ["calendar"], calendar_stage),
+    Stage("schedule", ["tasks", "project_input", "network", "durations"], ["schedule", "total_duration"], schedule_stage),
+    Stage("critical_path", ["schedule", "tasks", "network"], ["critical_path", "task_analytics"], critical_path_stage),
+    Stage("cost", ["schedule", "tasks_dict", "project_input"], ["cost_estimate"], cost_stage),
+    Stage("leveling", ["schedule", "network", "task_analytics"], ["leveling"], leveling_stage),
+    Stage(
+        "constraints", ["schedule", "cost_estimate", "project_input", "tasks_dict", "calendar"], ["feasibility"],
+        constraints_stage, optional_inputs=["leveling"]
+    ),
+    Stage("simulation", ["tasks", "project_input", "network", "durations", "calendar"], ["simulation_results"], simulation_stage),
+    Stage(
+        "summary", ["project_input", "total_duration", "cost_estimate", "feasibility"], ["executive_summary"],
+        summary_stage, optional_inputs=["simulation_results", "critical_path"]
+    ),
+], max_workers=settings.PIPELINE_MAX_WORKERS)
 
-    # 6. LLM Summary
-    project_data = {
-        "input_parameters": project_input.dict(),
-        "duration": total_duration,
-        "cost_breakdown": total_cost_estimate.dict(),
-        "feasibility": feasibility,
-        "risks": simulation_results.dict(),
-        "critical_path": critical_path
-    }
-    
-    try:
-        from backend.llm_factory import LLMFactory
-        llm_service = LLMFactory.get_service(project_input.provider, project_input.api_key)
-        summary = llm_service.generate_summary(project_data)
-    except Exception as e:
-        summary = f"LLM Summary Validation Failed: {str(e)}"
+# Always produced; optional stages (selectable via skip_stages) add their output
+CORE_ARTIFACTS = ["schedule", "total_duration", "calendar", "cost_estimate", "feasibility"]
+OPTIONAL_STAGE_OUTPUTS = {
+    "critical_path": "critical_path",
+    "leveling": "leveling",
+    "simulation": "simulation_results",
+    "summary": "executive_summary",
+}
+
+def run_analysis(project_input: ProjectInput, progress_callback=None) -> ProjectAnalysisResponse:
+    """
+    Runs the analysis pipeline synchronously (shared by the endpoint and background jobs).
+    Skipping a stage only drops it when no other requested stage needs its output.
+    `progress_callback(done, total)` is called after each stage.
+    """
+    unknown = set(project_input.skip_stages) - set(OPTIONAL_STAGE_OUTPUTS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown stages in skip_stages: {sorted(unknown)} (optional stages: {sorted(OPTIONAL_STAGE_OUTPUTS)})"
+        )
+    targets = CORE_ARTIFACTS + [
+        output for stage, output in OPTIONAL_STAGE_OUTPUTS.items() if stage not in project_input.skip_stages
+    ]
+    artifacts = analysis_pipeline.run(
+        {"project_input": project_input, "tasks": get_project_tasks(project_input)}, targets,
+        progress_callback=progress_callback
+    )
+
+    schedule = artifacts["schedule"]
+    total_duration = artifacts["total_duration"]
+    feasibility = artifacts["feasibility"]
+    calendar = artifacts["calendar"]
+    calendar_schedule = calendar.schedule_dates(schedule) if calendar else None
 
     return ProjectAnalysisResponse(
         deterministic_schedule=schedule,
         total_duration=total_duration,
-        total_cost=total_cost_estimate,
+        total_cost=artifacts["cost_estimate"],
         feasibility_status="Feasible" if feasibility['feasible'] else "Infeasible",
         constraint_issues=feasibility.get("issues", []),
         optimization_suggestions=feasibility.get("suggestions", []),
-        simulation_results=simulation_results,
-        critical_path_tasks=critical_path,
-        executive_summary=summary
+        simulation_results=artifacts.get("simulation_results"),
+        critical_path_tasks=artifacts.get("critical_path", []),
+        executive_summary=artifacts.get("executive_summary", ""),
+        calendar_schedule=calendar_schedule,
+        completion_date=calendar.end_date_of(total_duration) if calendar else None,
+        deadline_date=calendar.start_date + timedelta(days=project_input.deadline - 1) if calendar else None
+    )
+
+@app.post("/analyze_project", response_model=ProjectAnalysisResponse)
+async def analyze_project(project_input: ProjectInput):
+    """
+    Analyzes the project feasibility, cost, schedule, and risks.
+    Concurrent identical requests (ignoring api_key) are coalesced into one
+    run, executed off the event loop.
+    """
+    key = request_fingerprint(project_input)
+    return await analysis_flight.do(key, lambda: run_in_threadpool(run_analysis, project_input))
+
+async def analyze_batch_item(project_input: ProjectInput) -> BatchAnalysisItem:
+    try:
+        return BatchAnalysisItem(status_code=200, result=await analyze_project(project_input))
+    except HTTPException as e:
+        return BatchAnalysisItem(status_code=e.status_code, error=str(e.detail))
+
+@app.post("/analyze_batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(batch: BatchAnalysisRequest):
+    """
+    Analyzes several projects in one call. Projects run concurrently through
+    the same coalesced path as /analyze_project; a failing project reports
+    its own status_code instead of failing the whole batch.
+    """
+    if len(batch.projects) > settings.BATCH_MAX_PROJECTS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.BATCH_MAX_PROJECTS} projects")
+    results = await asyncio.gather(*(analyze_batch_item(p) for p in batch.projects))
+    return BatchAnalysisResponse(results=list(results))
+
+@app.post("/level_resources", response_model=LevelingResult)
+async def level_resources(project_input: ProjectInput):
+    """
+    Shifts non-critical tasks within their slack to flatten the daily
+    workforce profile; returns the leveled schedule and both profiles.
+    """
+    def level() -> LevelingResult:
+        artifacts = analysis_pipeline.run(
+            {"project_input": project_input, "tasks": get_project_tasks(project_input)}, ["leveling"]
+        )
+        return artifacts["leveling"]
+    return await run_in_threadpool(level)
+
+@app.post("/portfolio/schedule", response_model=PortfolioResult)
+async def schedule_portfolio(request: PortfolioRequest):
+    """
+    Schedules several projects against one shared daily workforce,
+    minimizing total priority-weighted lateness.
+    """
+    def schedule() -> PortfolioResult:
+        try:
+            return PortfolioScheduler(get_project_tasks).schedule(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await run_in_threadpool(schedule)
+
+@app.post("/solve", response_model=SolveResult)
+async def solve_for(request: SolveRequest):
+    """
+    Goal seek: the minimum workforce_cap or budget, or the earliest deadline,
+    that makes the project feasible (deterministically or at a confidence level).
+    """
+    def solve() -> SolveResult:
+        try:
+            return GoalSolver(get_project_tasks).solve(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await run_in_threadpool(solve)
+
+@app.post("/sensitivity/sobol", response_model=SensitivityResult)
+async def sobol_sensitivity(request: SensitivityRequest):
+    """
+    Global sensitivity: first-order and total Sobol indices of project
+    duration and cost for area, per-task rates and per-task variation.
+    """
+    def analyze() -> SensitivityResult:
+        try:
+            return SobolAnalyzer(get_project_tasks, settings.SENSITIVITY_MAX_EVALUATIONS).analyze(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await run_in_threadpool(analyze)
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "npy": "application/octet-stream"}
+
+@app.post("/simulation/export")
+async def export_simulation_samples(export_request: SimulationExportRequest):
+    """
+    Streams raw Monte Carlo samples (run, duration, cost and optionally every
+    task instance's sampled duration) as CSV or .npy. Blocks are simulated
+    and written one at a time, so memory stays flat even for 10M runs.
+    """
+    if export_request.format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_request.format}")
+    project_input = export_request.project
+    try:
+        network = TaskNetwork.for_project(get_project_tasks(project_input), project_input)
+        columns = export_columns(network.instance_ids, export_request.include_tasks)
+        batches = RiskSimulator().iter_batches(
+            network, project_input, export_request.num_simulations,
+            seed=export_request.seed, batch_size=export_batch_size(len(columns))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if export_request.format == "csv":
+        body = stream_csv(batches, columns, export_request.include_tasks)
+    else:
+        body = stream_npy(batches, export_request.num_simulations, columns, export_request.include_tasks)
+    return StreamingResponse(
+        body, # Sync generator: Starlette iterates it in a worker thread
+        media_type=EXPORT_MEDIA_TYPES[export_request.format],
+        headers={"Content-Disposition": f'attachment; filename="simulation_samples.{export_request.format}"'}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "analyze_project": analysis_flight.metrics(),
+        "llm": llm_orchestrator.metrics(),
+        "prompt": prompt_stats.as_dict(),
+        "pipeline": analysis_pipeline.metrics()
+    }
+
+# Background Jobs
+SWEEPABLE_PARAMETERS = {"area", "floors", "deadline", "budget", "workforce_cap", "material_volatility"}
+
+def run_simulation_job(job_request: JobRequest, report_progress):
+    project_input = job_request.project
+    tasks = get_project_tasks(project_input)
+    try:
+        network = TaskNetwork.for_project(tasks, project_input)
+        calendar = WorkCalendar.for_project(project_input)
+        return RiskSimulator().run_simulation(
+            tasks, project_input,
+            num_simulations=job_request.num_simulations,
+            network=network,
+            seed=job_request.seed,
+            calendar=calendar,
+            progress_callback=report_progress
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def run_sweep_job(job_request: JobRequest, report_progress):
+    """
+    Re-runs the simulation for every sweep value; progress spans all runs.
+    """
+    parameter = job_request.sweep_parameter
+    field_type = type(getattr(job_request.project, parameter))
+    total = len(job_request.sweep_values) * job_request.num_simulations
+    results = []
+    for i, value in enumerate(job_request.sweep_values):
+        offset = i * job_request.num_simulations
+        step_request = job_request.copy(update={
+            "project": job_request.project.copy(update={parameter: field_type(value)})
+        })
+        result = run_simulation_job(
+            step_request,
+            lambda done, _total: report_progress(offset + done, total)
+        )
+        results.append({"value": value, "simulation_results": result})
+    return {"sweep_parameter": parameter, "results": results}
+
+def run_analysis_job(job_request: JobRequest, report_progress):
+    # Checkpoints between pipeline stages make running analyses cancellable
+    report_progress(0, 1)
+    return run_analysis(job_request.project, progress_callback=report_progress)
+
+JOB_RUNNERS = {
+    "simulation": run_simulation_job,
+    "sweep": run_sweep_job,
+    "analysis": run_analysis_job,
+}
+
+@app.post("/jobs", response_model=JobInfo, status_code=202)
+async def submit_job(job_request: JobRequest):
+    """
+    Queues a long-running simulation, sweep or full analysis.
+    """
+    runner = JOB_RUNNERS.get(job_request.kind)
+    if runner is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported job kind: {job_request.kind}")
+    if job_request.kind == "sweep":
+        if job_request.sweep_parameter not in SWEEPABLE_PARAMETERS or not job_request.sweep_values:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Sweeps need sweep_values and a sweep_parameter in {sorted(SWEEPABLE_PARAMETERS)}"
+            )
+    try:
+        job = job_manager.submit(job_request.kind, lambda job: runner(job_request, job.report_progress))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.info(job_manager.retention)
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job_status(job_id: str):
+    return get_job_or_404(job_id).info(job_manager.retention)
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = get_job_or_404(job_id)
+    if job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo)
+async def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.info(job_manager.retention)
+
+# Interactive Planning Session
+def summarize_session(session: PlanningSession) -> str:
+    project_data = build_project_data(
+        session.project_input, session.total_duration, session.cost_estimate,
+        session.feasibility, session.simulation_results, session.critical_path
+    )
+    return generate_executive_summary(session.project_input, project_data)
+
+@app.websocket("/ws/session")
+async def planning_session(websocket: WebSocket):
+    """
+    Live planning over a WebSocket: send parameter deltas, receive only the
+    result fields that changed; the LLM summary follows once input settles.
+    """
+    await websocket.accept()
+    await serve_session(
+        websocket,
+        PlanningSession(get_project_tasks),
+        summarize_session,
+        debounce_seconds=settings.SESSION_DEBOUNCE_SECONDS,
+        settle_seconds=settings.SESSION_SUMMARY_SETTLE_SECONDS,
+        max_wait_seconds=settings.SESSION_MAX_WAIT_SECONDS
     )
 
 @app.get("/")
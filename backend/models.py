@@ -1,5 +1,14 @@
+from datetime import date, datetime
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
+
+class DurationDistribution(BaseModel):
+    kind: str = Field(default="uniform", description="'uniform', 'triangular', 'pert', 'lognormal' or 'empirical'; values are multipliers of the deterministic duration")
+    low: float = Field(default=0.85, description="Minimum multiplier (uniform, triangular, pert)")
+    mode: float = Field(default=1.0, description="Most likely multiplier (triangular, pert); median for lognormal")
+    high: float = Field(default=1.15, description="Maximum multiplier (uniform, triangular, pert)")
+    sigma: float = Field(default=0.1, description="Log-space standard deviation (lognormal)")
+    samples: List[float] = Field(default_factory=list, description="Observed multipliers (empirical)")
 
 class ConstructionTask(BaseModel):
     id: str
@@ -8,21 +17,53 @@ class ConstructionTask(BaseModel):
     required_workers: int
     cost_per_day: float
     dependencies: List[str] = Field(default_factory=list, description="List of task IDs this task depends on")
+    repeat_per_floor: bool = Field(default=False, description="Task repeats once per floor in line-of-balance mode")
+    floor_dependencies: List[str] = Field(default_factory=list, description="Per-floor task IDs on the floor below that must finish before this task starts on the next floor")
+    duration_distribution: Optional[DurationDistribution] = Field(default=None, description="Simulation duration model (default: uniform 0.85-1.15)")
+    correlation_group: Optional[str] = Field(default=None, description="Tasks in the same group share correlated duration shocks (e.g. 'weather')")
 
 class ProjectInput(BaseModel):
-    area: float = Field(..., description="Total area in square yards")
+    area: float = Field(..., description="Total area in square yards (per floor in line-of-balance mode)")
     floors: int = Field(..., description="Number of floors")
-    deadline: int = Field(..., description="Deadline in days")
+    scheduling_mode: Literal["standard", "line_of_balance"] = Field(default="standard", description="Scheduling mode: 'standard' or 'line_of_balance' (per-floor tasks repeat for every floor)")
+    deadline: int = Field(..., description="Deadline in days (calendar days from start_date when a calendar is used)")
     budget: float = Field(..., description="Total budget in currency units")
     workforce_cap: int = Field(..., description="Maximum number of workers available per day")
-    provider: str = Field(default="gemini", description="LLM Provider: 'gemini' or 'groq'")
+    provider: str = Field(default="gemini", description="LLM Provider: 'gemini', 'groq' or 'stub' (offline, for testing)")
     api_key: str = Field(..., description="API Key for the selected provider")
+    start_date: Optional[date] = Field(default=None, description="Project start date; enables working-calendar scheduling")
+    working_weekdays: List[int] = Field(default_factory=lambda: [0, 1, 2, 3, 4], description="Working weekdays (Monday=0 ... Sunday=6)")
+    holidays: List[date] = Field(default_factory=list, description="Non-working dates")
+    tasks: Optional[List[ConstructionTask]] = Field(default=None, description="Custom task network (defaults to the built-in 15-task template)")
+    correlation_groups: Dict[str, float] = Field(default_factory=dict, description="Correlation (0-1) of duration shocks within each correlation_group")
+    material_volatility: float = Field(default=0.0, ge=0, description="Std-dev of material price as a fraction of the base cost (simulation only)")
+    quantiles: List[float] = Field(default_factory=lambda: [10, 50, 80, 90], description="Duration percentiles (0-100) reported by the simulation")
+    histogram_bins: int = Field(default=30, ge=1, le=200, description="Number of fixed-width bins in the duration histogram")
+    cdf_points: int = Field(default=51, ge=2, le=501, description="Number of points in the downsampled duration CDF")
+    skip_stages: List[str] = Field(default_factory=list, description="Optional analysis stages to skip: 'critical_path', 'leveling', 'simulation', 'summary'")
+
+
+class DurationHistogram(BaseModel):
+    bin_edges: List[float]
+    counts: List[int]
 
+class DurationCdf(BaseModel):
+    durations: List[float]
+    probabilities: List[float]
 
 class SimulationResult(BaseModel):
     p50_duration: float
     p80_duration: float
     deadline_risk_probability: float
+    p50_date: Optional[date] = None
+    p80_date: Optional[date] = None
+    p50_cost: float = 0.0
+    p80_cost: float = 0.0
+    budget_overrun_probability: float = 0.0
+    joint_overrun_probability: float = Field(default=0.0, description="Probability (%) of missing both deadline and budget")
+    duration_quantiles: Dict[str, float] = Field(default_factory=dict, description="Requested duration percentiles keyed as 'p<percentile>'")
+    duration_histogram: Optional[DurationHistogram] = None
+    duration_cdf: Optional[DurationCdf] = Field(default=None, description="Duration at evenly spaced cumulative probabilities (S-curve)")
 
 class CostEstimate(BaseModel):
     labor_cost: float
@@ -38,6 +79,124 @@ class ProjectAnalysisResponse(BaseModel):
     feasibility_status: str
     constraint_issues: List[str] = Field(default_factory=list, description="List of constraint violations")
     optimization_suggestions: List[str]
-    simulation_results: SimulationResult
-    critical_path_tasks: List[str]
+    simulation_results: Optional[SimulationResult] = Field(default=None, description="Monte Carlo risk results (None when the simulation stage is skipped)")
+    critical_path_tasks: List[str] = Field(default_factory=list)
     executive_summary: str = Field(default="", description="AI-generated executive summary")
+    calendar_schedule: Optional[Dict[str, Dict[str, date]]] = Field(default=None, description="Task start and finish dates (when start_date is given)")
+    completion_date: Optional[date] = None
+    deadline_date: Optional[date] = None
+
+class LevelingResult(BaseModel):
+    leveled_schedule: Dict[str, Dict[str, int]] = Field(..., description="Task start and end days after leveling")
+    total_duration: int = Field(..., description="Project duration (unchanged by leveling)")
+    moved_tasks: List[str] = Field(default_factory=list, description="Tasks whose start day changed")
+    profile_before: List[int] = Field(..., description="Workers needed per day, early-start schedule")
+    profile_after: List[int] = Field(..., description="Workers needed per day, leveled schedule")
+    peak_before: int
+    peak_after: int
+    variance_before: float
+    variance_after: float
+
+class PortfolioProject(BaseModel):
+    project_id: str
+    project: ProjectInput
+    priority: float = Field(default=1.0, gt=0, description="Weight of this project's lateness")
+    release_day: int = Field(default=0, ge=0, description="First day the project may start (portfolio day)")
+
+class PortfolioRequest(BaseModel):
+    projects: List[PortfolioProject] = Field(..., min_length=1)
+    workforce_capacity: int = Field(..., gt=0, description="Shared workers available per day across all projects")
+
+class PortfolioProjectSchedule(BaseModel):
+    project_id: str
+    schedule: Dict[str, Dict[str, int]] = Field(..., description="Task start and end (portfolio days)")
+    start_day: int
+    finish_day: int
+    deadline: int = Field(..., description="Deadline in portfolio days (release_day + project deadline)")
+    unconstrained_finish_day: int = Field(..., description="Finish with unlimited workers (CPM)")
+    lateness: int
+    weighted_lateness: float
+
+class PortfolioResult(BaseModel):
+    projects: List[PortfolioProjectSchedule]
+    total_weighted_lateness: float
+    makespan: int
+    peak_workforce: int
+    workforce_profile: List[int] = Field(..., description="Workers in use per portfolio day")
+    priority_rule: str = Field(..., description="Dispatching rule that produced the best schedule")
+
+class BatchAnalysisRequest(BaseModel):
+    projects: List[ProjectInput] = Field(..., min_length=1, description="Projects analyzed in one call")
+
+class BatchAnalysisItem(BaseModel):
+    status_code: int = Field(..., description="HTTP status the project would have received on /analyze_project")
+    result: Optional[ProjectAnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchAnalysisItem]
+
+class JobRequest(BaseModel):
+    kind: str = Field(default="simulation", description="Job type: 'simulation', 'sweep' or 'analysis'")
+    project: ProjectInput
+    num_simulations: int = Field(default=10000, ge=1, le=10_000_000, description="Monte Carlo runs (simulation and sweep jobs)")
+    sweep_parameter: Optional[str] = Field(default=None, description="Numeric ProjectInput field varied by a sweep, e.g. 'workforce_cap'")
+    sweep_values: List[float] = Field(default_factory=list, description="Values taken by the sweep parameter")
+    seed: Optional[int] = None
+
+class SimulationExportRequest(BaseModel):
+    project: ProjectInput
+    num_simulations: int = Field(default=10000, ge=1, le=10_000_000, description="Monte Carlo runs to export")
+    format: str = Field(default="csv", description="'csv' or 'npy'")
+    include_tasks: bool = Field(default=False, description="Also export every task instance's sampled duration")
+    seed: Optional[int] = None
+
+class SolveRequest(BaseModel):
+    project: ProjectInput
+    parameter: str = Field(..., description="Parameter to solve for: 'workforce_cap', 'budget' or 'deadline'")
+    target: str = Field(default="confidence", description="'confidence' (met in `confidence`% of simulated runs) or 'deterministic' (zero violations in the deterministic schedule)")
+    confidence: float = Field(default=80.0, gt=0, le=100, description="Required probability (%) for the 'confidence' target")
+    num_simulations: int = Field(default=2000, ge=1, le=200_000, description="Monte Carlo runs shared by every probe")
+    seed: Optional[int] = Field(default=0, description="Seed of the common random numbers (fixed by default for reproducible answers)")
+
+class SolveResult(BaseModel):
+    parameter: str
+    target: str
+    current_value: float
+    value: float = Field(..., description="Minimum workforce_cap / budget, or earliest deadline, that meets the target")
+    probability: Optional[float] = Field(default=None, description="Share of runs (%) meeting the constraint at `value` (confidence target)")
+    current_probability: Optional[float] = Field(default=None, description="Share of runs (%) meeting the constraint at the current value")
+    feasible: bool = Field(..., description="Deterministic feasibility with `value` substituted")
+    remaining_issues: List[str] = Field(default_factory=list, description="Violations of the other constraints, which this parameter cannot fix")
+
+class SensitivityRequest(BaseModel):
+    project: ProjectInput
+    num_samples: int = Field(default=1024, ge=16, le=65536, description="Base samples N; the Saltelli design evaluates N x (factors + 2) scenarios")
+    area_range: float = Field(default=0.1, ge=0, lt=1, description="Area varies uniformly within +/- this fraction")
+    rate_range: float = Field(default=0.2, ge=0, lt=1, description="Each task's base_duration_per_sqyard varies uniformly within +/- this fraction")
+    seed: Optional[int] = None
+
+class SobolIndex(BaseModel):
+    factor: str = Field(..., description="'area', '<task_id>.rate', '<task_id>.variation' (its duration distribution, all floors) or 'material_price'")
+    duration_first_order: float
+    duration_total: float
+    cost_first_order: float
+    cost_total: float
+
+class SensitivityResult(BaseModel):
+    indices: List[SobolIndex] = Field(..., description="Sorted by total duration index, largest first")
+    num_evaluations: int
+    duration_mean: float
+    duration_variance: float
+    cost_mean: float
+    cost_variance: float
+
+class JobInfo(BaseModel):
+    job_id: str
+    kind: str
+    status: str = Field(..., description="queued, running, completed, failed or cancelled")
+    progress: float = Field(..., description="Fraction complete (0-1)")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -0,0 +1,260 @@
+import math
+from typing import Dict, List, Tuple
+import networkx as nx
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput
+
+LINE_OF_BALANCE = "line_of_balance"
+
+
+class TaskNetwork:
+    """
+    Compiled Task Network (Template x Floors)
+
+    Tasks flagged with `repeat_per_floor` are templates that expand into one
+    instance per floor. Instances are never stored as graph nodes: each template
+    keeps small offset arrays and the predecessors of floor f are derived as
+    `offsets + f`, so a 60-floor tower costs the same to compile as one floor.
+
+    Dependency rules:
+    - Single -> Single / Repeated -> Repeated (same floor): as declared.
+    - Repeated task on floor f+1 waits for itself on floor f (crew continuity)
+      and for its `floor_dependencies` on floor f.
+    - Repeated task on the first floor waits for its single-task dependencies.
+    - Single task depending on a repeated task waits for the last floor.
+    """
+
+    def __init__(self, tasks: List[ConstructionTask], floors: int = 1):
+        self.floors = max(1, int(floors))
+        self.templates: Dict[str, ConstructionTask] = {}
+        for task in tasks:
+            self.templates[task.id] = task
+        self._compile()
+
+    @classmethod
+    def for_project(cls, tasks: List[ConstructionTask], project_input: ProjectInput) -> "TaskNetwork":
+        floors = project_input.floors if project_input.scheduling_mode == LINE_OF_BALANCE else 1
+        return cls(tasks, floors)
+
+    def _is_repeated(self, task_id: str) -> bool:
+        return self.floors > 1 and self.templates[task_id].repeat_per_floor
+
+    def _compile(self):
+        # 1. Template graph (small, one node per task definition)
+        graph = nx.DiGraph()
+        for task_id, task in self.templates.items():
+            graph.add_node(task_id)
+            for dep in task.dependencies:
+                if dep in self.templates:
+                    graph.add_edge(dep, task_id)
+
+        if not nx.is_directed_acyclic_graph(graph):
+            raise ValueError("Cycle detected in dependencies")
+
+        template_order = list(nx.topological_sort(graph))
+
+        # 2. Phases: singles before the floors, repeated floor loop, singles after
+        # (one topological DP each way instead of per-task ancestor searches)
+        after_repeated, before_repeated = {}, {}
+        for task_id in template_order:
+            after_repeated[task_id] = any(
+                self._is_repeated(p) or after_repeated[p] for p in graph.predecessors(task_id)
+            )
+        for task_id in reversed(template_order):
+            before_repeated[task_id] = any(
+                self._is_repeated(s) or before_repeated[s] for s in graph.successors(task_id)
+            )
+
+        pre_singles, repeated, post_singles = [], [], []
+        for task_id in template_order:
+            if self._is_repeated(task_id):
+                repeated.append(task_id)
+                continue
+            downstream = after_repeated[task_id]
+            upstream = before_repeated[task_id]
+            if downstream and upstream:
+                raise ValueError(f"Task {task_id} sits between per-floor tasks on different floors")
+            (post_singles if downstream else pre_singles).append(task_id)
+
+        # 3. Instance layout: each template owns a contiguous block of slots
+        self.template_ids: List[str] = pre_singles + repeated + post_singles
+        self.offsets: Dict[str, int] = {}
+        self.slots: Dict[str, int] = {}
+        position = 0
+        for task_id in self.template_ids:
+            slots = self.floors if self._is_repeated(task_id) else 1
+            self.offsets[task_id] = position
+            self.slots[task_id] = slots
+            position += slots
+        self.size = position
+
+        # 4. Predecessor / successor rules per template.
+        # For repeated templates the "*_base" arrays hold floor-0 slots and are
+        # shifted by the floor number at run time; everything else is absolute.
+        offsets = self.offsets
+        last = self.floors - 1
+        repeated_set = set(repeated)
+
+        same_preds = {t: [] for t in self.template_ids}      # same floor (repeated) / absolute (single)
+        single_preds = {t: [] for t in repeated}             # first floor only
+        prev_preds = {t: [] for t in repeated}               # previous floor
+        same_succs = {t: [] for t in self.template_ids}
+        next_succs = {t: [] for t in repeated}               # next floor
+        top_succs = {t: [] for t in repeated}                # last floor only
+
+        for task_id in self.template_ids:
+            task = self.templates[task_id]
+            for dep in task.dependencies:
+                if dep not in self.templates:
+                    continue
+                if task_id in repeated_set and dep in repeated_set:
+                    same_preds[task_id].append(offsets[dep])
+                    same_succs[dep].append(offsets[task_id])
+                elif task_id in repeated_set:
+                    # Single -> first floor; later floors follow via the floor chain
+                    single_preds[task_id].append(offsets[dep])
+                    same_succs[dep].append(offsets[task_id])
+                elif dep in repeated_set:
+                    # Last floor -> single
+                    same_preds[task_id].append(offsets[dep] + last)
+                    top_succs[dep].append(offsets[task_id])
+                else:
+                    same_preds[task_id].append(offsets[dep])
+                    same_succs[dep].append(offsets[task_id])
+
+            if task_id in repeated_set:
+                # Crew continuity plus declared floor-to-floor dependencies
+                for dep in [task_id] + list(task.floor_dependencies):
+                    if dep in repeated_set:
+                        prev_preds[task_id].append(offsets[dep])
+                        next_succs[dep].append(offsets[task_id])
+
+        def arr(values) -> np.ndarray:
+            return np.array(sorted(set(values)), dtype=np.int64)
+
+        # Plan entry: (slot, first_floor_preds, upper_preds_base, upper_succs_base, top_succs)
+        self._plan: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for task_id in self.template_ids:
+            slot = offsets[task_id]
+            if task_id in repeated_set:
+                same_p = np.array(same_preds[task_id], dtype=np.int64)
+                same_s = np.array(same_succs[task_id], dtype=np.int64)
+                self._plan.append((
+                    slot,
+                    arr(list(same_p) + single_preds[task_id]),
+                    arr(list(same_p) + [p - 1 for p in prev_preds[task_id]]),
+                    arr(list(same_s) + [s + 1 for s in next_succs[task_id]]),
+                    arr(list(same_s + last) + top_succs[task_id]),
+                ))
+            else:
+                self._plan.append((slot, arr(same_preds[task_id]), arr([]), arr([]), arr(same_succs[task_id])))
+
+        self._repeated = repeated_set
+        self._phases = (len(pre_singles), len(pre_singles) + len(repeated))
+
+    def _iter_order(self):
+        """
+        Yields (slot, predecessor slots) in topological order.
+        """
+        n_pre, n_rep_end = self._phases
+        for slot, preds, _, _, _ in self._plan[:n_pre]:
+            yield slot, preds
+        repeated_plan = self._plan[n_pre:n_rep_end]
+        for floor in range(self.floors):
+            for slot, first_preds, upper_preds, _, _ in repeated_plan:
+                yield slot + floor, (first_preds if floor == 0 else upper_preds + floor)
+        for slot, preds, _, _, _ in self._plan[n_rep_end:]:
+            yield slot, preds
+
+    def _iter_reverse(self):
+        """
+        Yields (slot, successor slots) in reverse topological order.
+        """
+        n_pre, n_rep_end = self._phases
+        last = self.floors - 1
+        for slot, _, _, _, succs in reversed(self._plan[n_rep_end:]):
+            yield slot, succs
+        repeated_plan = self._plan[n_pre:n_rep_end]
+        for floor in range(last, -1, -1):
+            for slot, _, _, upper_succs, top_succs in reversed(repeated_plan):
+                yield slot + floor, (top_succs if floor == last else upper_succs + floor)
+        for slot, _, _, _, succs in reversed(self._plan[:n_pre]):
+            yield slot, succs
+
+    # ------------------------------------------------------------------
+    # Public helpers
+    # ------------------------------------------------------------------
+    @property
+    def instance_ids(self) -> List[str]:
+        ids = []
+        for task_id in self.template_ids:
+            if task_id in self._repeated:
+                ids.extend(f"{task_id}@F{floor + 1}" for floor in range(self.floors))
+            else:
+                ids.append(task_id)
+        return ids
+
+    def template_of(self, instance_id: str) -> str:
+        return instance_id.split("@F", 1)[0]
+
+    def task_map(self) -> Dict[str, ConstructionTask]:
+        """
+        Maps every instance id to its template task (shared objects, no copies).
+        """
+        return {instance_id: self.templates[self.template_of(instance_id)] for instance_id in self.instance_ids}
+
+    def expand(self, values: Dict[str, float]) -> np.ndarray:
+        """
+        Broadcasts a per-template value to every instance slot.
+        """
+        per_template = np.array([values[t] for t in self.template_ids])
+        repeats = np.array([self.slots[t] for t in self.template_ids])
+        return np.repeat(per_template, repeats)
+
+    def dependencies(self) -> Tuple[List[int], List[np.ndarray], List[np.ndarray]]:
+        """
+        Materializes (topological slot order, predecessor slots, successor slots)
+        per instance, for algorithms that move one instance at a time.
+        """
+        order, preds = [], [None] * self.size
+        for slot, slot_preds in self._iter_order():
+            order.append(slot)
+            preds[slot] = slot_preds
+        succs = [None] * self.size
+        for slot, slot_succs in self._iter_reverse():
+            succs[slot] = slot_succs
+        return order, preds, succs
+
+    def base_durations(self, area: float) -> np.ndarray:
+        """
+        Deterministic whole-day duration per instance: max(1, ceil(base * area)).
+        """
+        return self.expand({
+            task_id: max(1, int(math.ceil(task.base_duration_per_sqyard * area)))
+            for task_id, task in self.templates.items()
+        }).astype(np.int64)
+
+    def forward_pass(self, durations: np.ndarray) -> np.ndarray:
+        """
+        Earliest finish per slot. `durations` is (size,) or (size, runs);
+        the extra axis lets the simulator push every run through one pass.
+        """
+        finish = np.zeros_like(durations)
+        for slot, preds in self._iter_order():
+            if preds.size:
+                finish[slot] = finish[preds].max(axis=0) + durations[slot]
+            else:
+                finish[slot] = durations[slot]
+        return finish
+
+    def backward_pass(self, durations: np.ndarray, project_duration) -> np.ndarray:
+        """
+        Latest finish per slot for the given project duration.
+        """
+        late_finish = np.full_like(durations, project_duration)
+        late_start = np.zeros_like(durations)
+        for slot, succs in self._iter_reverse():
+            if succs.size:
+                late_finish[slot] = late_start[succs].min(axis=0)
+            late_start[slot] = late_finish[slot] - durations[slot]
+        return late_finish
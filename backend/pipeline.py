@@ -0,0 +1,170 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+class Stage:
+    """
+    One pipeline step: `run(**inputs)` returns a dict with exactly `outputs`.
+    `optional_inputs` are consumed when another requested stage produces
+    them (the stage then waits for it) and passed as None otherwise; they
+    never pull their producer into the plan.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Sequence[str],
+        outputs: Sequence[str],
+        run: Callable[..., Dict[str, Any]],
+        optional_inputs: Sequence[str] = ()
+    ):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.optional_inputs = tuple(optional_inputs)
+        self.run = run
+
+class AnalysisPipeline:
+    """
+    Dataflow Pipeline of Declared Stages
+
+    Stages name the artifacts they consume and produce. `run(initial, targets)`
+    plans only the stages the requested targets need, computes every shared
+    artifact once, and dispatches each stage as soon as its inputs exist:
+    when several become ready together (e.g. critical path, cost and
+    simulation once the schedule exists) the calling thread runs one and
+    offers the rest to a thread pool shared by all requests.
+
+    The pool (max_workers, PIPELINE_MAX_WORKERS) only adds parallelism: a
+    caller never waits for a worker, because offloaded stages that have not
+    started yet are taken back and run on the calling thread, and stages
+    never wait on each other inside the pool. Under load, requests therefore
+    degrade to sequential execution on their own threads instead of queueing
+    behind unrelated requests. Threads (not processes) keep compiled
+    networks shareable without pickling; the heavy stages spend their time
+    in NumPy, which releases the GIL.
+    Stage exceptions propagate to the caller unchanged; stages that have not
+    started yet are cancelled. `progress_callback(done, total)` is called on
+    the calling thread after each stage; raising from it aborts the run the
+    same way.
+    """
+
+    def __init__(self, stages: Iterable[Stage], max_workers: int = 4):
+        self.stages: Dict[str, Stage] = {}
+        self._producers: Dict[str, Stage] = {}
+        for stage in stages:
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"Artifact '{output}' is produced by two stages")
+                self._producers[output] = stage
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+        self._lock = threading.Lock()
+        self._timings: Dict[str, List[float]] = {name: [0, 0.0] for name in self.stages} # [runs, seconds]
+
+    def plan(self, targets: Iterable[str], available: Iterable[str] = ()) -> List[Stage]:
+        """
+        Stages needed to produce `targets` from the `available` artifacts,
+        in dependency order.
+        """
+        available = set(available)
+        planned: List[Stage] = []
+        visiting = set()
+
+        def need(artifact: str):
+            if artifact in available:
+                return
+            stage = self._producers.get(artifact)
+            if stage is None:
+                raise ValueError(f"No stage produces '{artifact}'")
+            if stage in planned:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Stage '{stage.name}' depends on itself")
+            visiting.add(stage.name)
+            for dependency in stage.inputs:
+                need(dependency)
+            visiting.discard(stage.name)
+            planned.append(stage)
+
+        for target in targets:
+            need(target)
+        return planned
+
+    def run(
+        self,
+        initial: Dict[str, Any],
+        targets: Iterable[str],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        artifacts = dict(initial)
+        remaining = self.plan(targets, artifacts)
+        total = len(remaining)
+        planned_outputs = {output for stage in remaining for output in stage.outputs}
+
+        def is_ready(stage: Stage) -> bool:
+            return all(i in artifacts for i in stage.inputs) and all(
+                i in artifacts or i not in planned_outputs for i in stage.optional_inputs
+            )
+
+        pending: Dict[Future, Stage] = {}
+
+        def finished(outputs: Dict[str, Any]):
+            artifacts.update(outputs)
+            if progress_callback:
+                progress_callback(total - len(remaining) - len(pending), total)
+
+        def collect(futures):
+            for future in futures:
+                pending.pop(future)
+                finished(future.result())
+
+        try:
+            while remaining or pending:
+                collect([f for f in pending if f.done()])
+                ready = [s for s in remaining if is_ready(s)]
+                if ready:
+                    # Offload all but one ready stage, run that one here
+                    for stage in ready:
+                        remaining.remove(stage)
+                    for stage in ready[1:]:
+                        pending[self._executor.submit(self._execute, stage, dict(artifacts))] = stage
+                    finished(self._execute(ready[0], artifacts))
+                    continue
+                if not pending:
+                    raise RuntimeError(f"Stages {[s.name for s in remaining]} can never become ready")
+                # Reclaim a stage still queued behind other requests instead of waiting for a worker
+                reclaimed = next((f for f in pending if f.cancel()), None)
+                if reclaimed is not None:
+                    finished(self._execute(pending.pop(reclaimed), artifacts))
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            for future in pending:
+                future.cancel()
+        return artifacts
+
+    def _execute(self, stage: Stage, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        kwargs = {name: artifacts.get(name) for name in stage.optional_inputs}
+        kwargs.update((name, artifacts[name]) for name in stage.inputs)
+        outputs = stage.run(**kwargs)
+        if set(outputs) != set(stage.outputs):
+            raise RuntimeError(f"Stage '{stage.name}' returned {sorted(outputs)}, declared {list(stage.outputs)}")
+        with self._lock:
+            timing = self._timings[stage.name]
+            timing[0] += 1
+            timing[1] += time.perf_counter() - started
+        return outputs
+
+    def metrics(self) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            return {
+                name: {"runs": runs, "avg_ms": round(seconds / runs * 1000, 2) if runs else None}
+                for name, (runs, seconds) in self._timings.items()
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,137 @@
+import heapq
+from typing import Callable, List
+from backend.models import (
+    ConstructionTask, ProjectInput, PortfolioProject, PortfolioRequest,
+    PortfolioProjectSchedule, PortfolioResult
+)
+from backend.network import TaskNetwork
+from backend.capacity_profile import CapacityProfile
+
+class _CompiledProject:
+    """
+    One portfolio member flattened to plain lists for the dispatch loop.
+    Days are portfolio days (the project's day 0 is its release_day).
+    """
+
+    def __init__(self, item: PortfolioProject, tasks: List[ConstructionTask]):
+        project = item.project
+        self.item = item
+        self.network = TaskNetwork.for_project(tasks, project)
+        durations = self.network.base_durations(project.area)
+        self.durations = durations.tolist()
+        self.workers = self.network.expand(
+            {t_id: t.required_workers for t_id, t in self.network.templates.items()}
+        ).astype(int).tolist()
+        _, self.preds, self.succs = self.network.dependencies()
+        self.preds = [p.tolist() for p in self.preds]
+        self.succs = [s.tolist() for s in self.succs]
+
+        release = item.release_day
+        self.deadline = release + project.deadline
+        self.unconstrained_finish = release + int(self.network.forward_pass(durations).max(initial=0))
+        # Latest start that still meets the deadline (negative slack when it cannot)
+        late_finish = self.network.backward_pass(durations, project.deadline) + release
+        self.late_start = (late_finish - durations).tolist()
+
+class PortfolioScheduler:
+    """
+    Shared-Workforce Portfolio Scheduler
+
+    Schedules several projects against one daily workforce capacity using a
+    serial schedule-generation scheme: tasks become eligible once all their
+    predecessors are placed, the most urgent eligible task (by a priority
+    rule) is placed at the earliest day where its whole duration fits in the
+    remaining capacity. The capacity is a segment tree (CapacityProfile), so
+    each placement is logarithmic in the horizon. Several priority rules are
+    run and the schedule with the lowest total weighted lateness (then the
+    shortest makespan) is returned.
+    """
+
+    # Priority keys (smaller = dispatched first); late_start is relative to each project's deadline
+    PRIORITY_RULES = {
+        "latest_start": lambda late_start, weight: (late_start, -weight),
+        "weighted_slack": lambda late_start, weight: (late_start / weight if late_start >= 0 else late_start * weight, -weight),
+        "project_priority": lambda late_start, weight: (-weight, late_start),
+    }
+
+    def __init__(self, resolve_tasks: Callable[[ProjectInput], List[ConstructionTask]]):
+        self.resolve_tasks = resolve_tasks
+
+    def schedule(self, request: PortfolioRequest) -> PortfolioResult:
+        """
+        Raises ValueError for cyclic networks or tasks needing more workers
+        than the shared capacity.
+        """
+        compiled = []
+        for item in request.projects:
+            try:
+                compiled.append(_CompiledProject(item, self.resolve_tasks(item.project)))
+            except ValueError as e:
+                raise ValueError(f"Project {item.project_id}: {e}")
+
+        best = None
+        for rule, key in self.PRIORITY_RULES.items():
+            starts, profile = self._dispatch(compiled, request.workforce_capacity, key)
+            finishes = [
+                max((s + d for s, d in zip(project_starts, c.durations)), default=c.item.release_day)
+                for project_starts, c in zip(starts, compiled)
+            ]
+            objective = sum(max(0, f - c.deadline) * c.item.priority for f, c in zip(finishes, compiled))
+            makespan = max(finishes, default=0)
+            if best is None or (objective, makespan) < best[0]:
+                best = ((objective, makespan), rule, starts, finishes, profile)
+
+        (objective, makespan), rule, starts, finishes, profile = best
+        workforce_profile = [request.workforce_capacity - free for free in profile.values(makespan)]
+        return PortfolioResult(
+            projects=[self._project_result(c, s, f) for c, s, f in zip(compiled, starts, finishes)],
+            total_weighted_lateness=float(round(objective, 2)),
+            makespan=makespan,
+            peak_workforce=max(workforce_profile, default=0),
+            workforce_profile=workforce_profile,
+            priority_rule=rule
+        )
+
+    def _dispatch(self, compiled: List[_CompiledProject], capacity: int, key):
+        horizon = max((c.unconstrained_finish for c in compiled), default=1) * 2
+        profile = CapacityProfile(capacity, horizon=horizon)
+        starts = [[0] * len(c.durations) for c in compiled]
+        finishes = [[0] * len(c.durations) for c in compiled]
+        waiting = [[len(p) for p in c.preds] for c in compiled]
+
+        eligible = []
+        for p, c in enumerate(compiled):
+            for slot, count in enumerate(waiting[p]):
+                if count == 0:
+                    heapq.heappush(eligible, (key(c.late_start[slot], c.item.priority), p, slot))
+
+        while eligible:
+            _, p, slot = heapq.heappop(eligible)
+            c = compiled[p]
+            ready = max((finishes[p][q] for q in c.preds[slot]), default=c.item.release_day)
+            duration, workers = c.durations[slot], c.workers[slot]
+            start = profile.earliest_fit(ready, duration, workers) if workers > 0 else ready
+            profile.reserve(start, start + duration, workers)
+            starts[p][slot], finishes[p][slot] = start, start + duration
+            for succ in c.succs[slot]:
+                waiting[p][succ] -= 1
+                if waiting[p][succ] == 0:
+                    heapq.heappush(eligible, (key(c.late_start[succ], c.item.priority), p, succ))
+        return starts, profile
+
+    @staticmethod
+    def _project_result(c: _CompiledProject, starts: List[int], finish: int) -> PortfolioProjectSchedule:
+        lateness = max(0, finish - c.deadline)
+        return PortfolioProjectSchedule(
+            project_id=c.item.project_id,
+            schedule={
+                task_id: {"start": s, "end": s + d}
+                for task_id, s, d in zip(c.network.instance_ids, starts, c.durations)
+            },
+            start_day=min(starts, default=c.item.release_day),
+            finish_day=finish,
+            deadline=c.deadline,
+            unconstrained_finish_day=c.unconstrained_finish,
+            lateness=lateness,
+            weighted_lateness=float(round(lateness * c.item.priority, 2))
+        )
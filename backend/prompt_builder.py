@@ -0,0 +1,161 @@
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List
+
+# Input fields summarized in the prompt (large lists such as tasks/holidays are counted, not listed)
+INPUT_FIELDS = ("area", "floors", "scheduling_mode", "deadline", "budget", "workforce_cap", "start_date", "material_volatility")
+RISK_FIELDS = (
+    "p50_duration", "p80_duration", "deadline_risk_probability", "p50_date", "p80_date",
+    "p50_cost", "p80_cost", "budget_overrun_probability", "joint_overrun_probability"
+)
+# Whole key names only: metric fields such as "prompt_tokens" must survive
+SECRET_PATTERN = re.compile(r"^(api_?key|(.*_)?secret|access_token|auth_token|password)$", re.IGNORECASE)
+MAX_CRITICAL_TASKS = 12
+MAX_LIST_ITEMS = 5
+SIZE_SAMPLE_ITEMS = 16 # List items measured by estimate_raw_chars; the rest are extrapolated
+
+def estimate_tokens(text: str) -> int:
+    """
+    Provider-neutral token estimate (~4 characters per token for English/JSON-like text).
+    """
+    return (len(text) + 3) // 4
+
+def estimate_raw_chars(value: Any) -> int:
+    """
+    Approximate len(str(value)) without building the string: long lists are
+    measured on their first SIZE_SAMPLE_ITEMS items and scaled by their count.
+    """
+    if isinstance(value, dict):
+        return 2 + sum(len(str(k)) + 4 + estimate_raw_chars(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        items = list(value)[:SIZE_SAMPLE_ITEMS] if len(value) > SIZE_SAMPLE_ITEMS else list(value)
+        sampled = sum(estimate_raw_chars(v) + 2 for v in items)
+        return 2 + (sampled * len(value) // len(items) if items else 0)
+    return len(str(value)) + 2
+
+def strip_secrets(value: Any) -> Any:
+    """
+    Recursively drops dict entries whose key looks like a credential.
+    """
+    if isinstance(value, dict):
+        return {k: strip_secrets(v) for k, v in value.items() if not SECRET_PATTERN.search(str(k))}
+    if isinstance(value, list):
+        return [strip_secrets(v) for v in value]
+    return value
+
+def _number(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.0f}" if abs(value) >= 1000 else f"{value:g}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+def _capped(items: List[str], limit: int) -> str:
+    shown = "; ".join(items[:limit])
+    return shown + (f"; +{len(items) - limit} more" if len(items) > limit else "")
+
+def _critical_path_line(critical_path: List[str]) -> str:
+    """
+    Line-of-balance paths repeat templates per floor ('T5@F3'); aggregate
+    them as 'T5 x60' in path order so the line stays short for tall buildings.
+    """
+    counts = Counter(task_id.split("@")[0] for task_id in critical_path)
+    ordered = list(dict.fromkeys(task_id.split("@")[0] for task_id in critical_path))
+    items = [f"{t} x{counts[t]}" if counts[t] > 1 else t for t in ordered]
+    return f"critical_path ({len(critical_path)} tasks): " + _capped(items, MAX_CRITICAL_TASKS)
+
+def build_sections(project_data: Dict) -> List[List[str]]:
+    """
+    Prompt lines grouped by priority (most important section first).
+    """
+    data = strip_secrets(project_data)
+    inputs = data.get("input_parameters", {})
+    feasibility = data.get("feasibility", {})
+    risks = data.get("risks", {})
+    cost = data.get("cost_breakdown", {})
+
+    input_items = [f"{k}={_number(inputs[k])}" for k in INPUT_FIELDS if inputs.get(k) is not None]
+    if inputs.get("tasks"):
+        input_items.append(f"custom_tasks={len(inputs['tasks'])}")
+    if inputs.get("holidays"):
+        input_items.append(f"holidays={len(inputs['holidays'])}")
+
+    outcome = [
+        "inputs: " + ", ".join(input_items),
+        f"verdict: {'feasible' if feasibility.get('feasible') else 'infeasible'}; "
+        f"deterministic_duration={_number(data.get('duration', 0))} days",
+        "cost: " + ", ".join(f"{k}={_number(v)}" for k, v in cost.items()),
+    ]
+    violations = []
+    issues = list(dict.fromkeys(feasibility.get("issues", []))) # Aggregate repeated messages
+    if issues:
+        violations.append(f"violations ({len(issues)}): " + _capped(issues, MAX_LIST_ITEMS))
+    risk_items = [f"{k}={_number(risks[k])}" for k in RISK_FIELDS if risks.get(k) is not None]
+    risk_items += [
+        f"{k}={_number(v)}" for k, v in risks.get("duration_quantiles", {}).items()
+        if f"{k}_duration" not in RISK_FIELDS # p50/p80 are already listed
+    ]
+    risk = ["risk: " + ", ".join(risk_items)]
+    critical = [_critical_path_line(data.get("critical_path", []))] if data.get("critical_path") else []
+    suggestions = sorted(feasibility.get("suggestions", [])) # Stored as a set: sort for determinism
+    advice = ["suggestions: " + _capped(suggestions, MAX_LIST_ITEMS)] if suggestions else []
+    return [outcome, violations, risk, critical, advice]
+
+class PromptStats:
+    def __init__(self):
+        self.built = 0
+        self.truncated = 0
+        self.prompt_tokens = 0
+        self.raw_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, prompt_tokens: int, raw_tokens: int, truncated: bool):
+        with self._lock:
+            self.built += 1
+            self.truncated += int(truncated)
+            self.prompt_tokens += prompt_tokens
+            self.raw_tokens += raw_tokens
+
+    def as_dict(self) -> Dict:
+        return {
+            "built": self.built,
+            "truncated": self.truncated,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.built, 1) if self.built else None,
+            "avg_raw_tokens": round(self.raw_tokens / self.built, 1) if self.built else None,
+            "reduction": round(1 - self.prompt_tokens / self.raw_tokens, 3) if self.raw_tokens else None,
+        }
+
+prompt_stats = PromptStats()
+
+def build_prompt_context(project_data: Dict, max_tokens: int = 400) -> str:
+    """
+    Compact, deterministic analysis summary for LLM prompts (replaces the
+    raw repr of project_data). Secrets are stripped; sections are added in
+    priority order and the result never exceeds `max_tokens` (estimated):
+    a line that does not fit is cut at a word boundary and every later line
+    is dropped, with a marker telling the model the context was truncated.
+    Sizes before/after are recorded in `prompt_stats` (the raw size is
+    estimated with estimate_raw_chars, never by stringifying the payload).
+    """
+    marker = "[context truncated]"
+    budget = max_tokens * 4 - len(marker) - 1 # Characters, reserving room for the marker
+    lines: List[str] = []
+    used = 0
+    truncated = False
+    for line in (line for section in build_sections(project_data) for line in section):
+        if used + len(line) + 1 <= budget:
+            lines.append(line)
+            used += len(line) + 1
+            continue
+        room = budget - used - 1
+        if room > 20:
+            lines.append(line[:room].rsplit(" ", 1)[0])
+        truncated = True
+        break
+    if truncated:
+        lines.append(marker)
+    text = "\n".join(lines)
+
+    prompt_stats.record(estimate_tokens(text), (estimate_raw_chars(project_data) + 3) // 4, truncated)
+    return text
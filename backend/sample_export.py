@@ -0,0 +1,47 @@
+import io
+from typing import Iterable, Iterator, List, Tuple
+import numpy as np
+
+# Rows are (run, duration, cost[, one column per task instance])
+Batch = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+def export_columns(instance_ids: List[str], include_tasks: bool) -> List[str]:
+    return ["run", "duration", "cost"] + (list(instance_ids) if include_tasks else [])
+
+def export_batch_size(columns: int, target_bytes: int = 8 * 1024 * 1024) -> int:
+    """
+    Runs per block so one block stays around `target_bytes` of float64,
+    independent of the total run count.
+    """
+    return max(1, min(10000, target_bytes // (8 * columns)))
+
+def _rows(batches: Iterable[Batch], include_tasks: bool) -> Iterator[np.ndarray]:
+    done = 0
+    for durations, costs, task_durations in batches:
+        runs = len(durations)
+        parts = [np.arange(done, done + runs, dtype=float), durations, costs]
+        block = np.column_stack(parts + ([task_durations.T] if include_tasks else []))
+        done += runs
+        yield block
+
+def stream_csv(batches: Iterable[Batch], columns: List[str], include_tasks: bool) -> Iterator[bytes]:
+    yield (",".join(columns) + "\n").encode("utf-8")
+    formats = ["%d", "%.6g", "%.2f"] + ["%.6g"] * (len(columns) - 3)
+    for block in _rows(batches, include_tasks):
+        buffer = io.StringIO()
+        np.savetxt(buffer, block, fmt=formats, delimiter=",")
+        yield buffer.getvalue().encode("utf-8")
+
+def stream_npy(batches: Iterable[Batch], num_runs: int, columns: List[str], include_tasks: bool) -> Iterator[bytes]:
+    """
+    A single (runs x columns) little-endian float64 .npy array. The shape is
+    known up front, so the header is written first and every block is
+    appended as raw C-order rows (np.load reads the result unchanged).
+    """
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, {"descr": "<f8", "fortran_order": False, "shape": (num_runs, len(columns))}
+    )
+    yield header.getvalue()
+    for block in _rows(batches, include_tasks):
+        yield np.ascontiguousarray(block, dtype="<f8").tobytes()
@@ -1,11 +1,14 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from backend.models import ConstructionTask, ProjectInput
+from backend.network import TaskNetwork
 import networkx as nx
+import numpy as np
 
 class Scheduler:
     def __init__(self, tasks: List[ConstructionTask]):
         self.tasks = {t.id: t for t in tasks}
         self.graph = nx.DiGraph()
+        self.network = None
         self._build_graph()
 
     def _build_graph(self):
@@ -15,55 +18,39 @@ class Scheduler:
                 if dep in self.tasks:
                     self.graph.add_edge(dep, task_id)
 
-    def calculate_schedule(self, project_input: ProjectInput) -> Dict[str, Dict[str, int]]:
+    def calculate_schedule(self, project_input: ProjectInput, network: Optional[TaskNetwork] = None, durations: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
         """
         Calculates the start and end dates for each task using Forward Pass (CPM).
         Returns a dictionary mapping task_id to {'start': day, 'end': day}.
+        In line-of-balance mode per-floor tasks are keyed as '<task_id>@F<floor>'.
+        A previously compiled `network` for the same tasks can be passed to skip compilation,
+        and its precomputed `durations` (network.base_durations) to skip recomputing them.
         """
-        schedule = {}
-        
-        # 1. Calculate Durations
-        # Use simple ceiling to ensure whole days. 
-        # For very small tasks, minimum duration is 1 day.
-        import math
-        task_durations = {}
-        for task_id, task in self.tasks.items():
-            duration = math.ceil(task.base_duration_per_sqyard * project_input.area)
-            task_durations[task_id] = max(1, int(duration))
+        # 1. Compile Network (also performs cycle detection)
+        if network is not None:
+            self.network = network
+        else:
+            try:
+                self.network = TaskNetwork.for_project(list(self.tasks.values()), project_input)
+            except ValueError as e:
+                print(e) # Log error
+                self.network = None
+                return {}
 
-        # 2. Cycle Detection
-        if not nx.is_directed_acyclic_graph(self.graph):
-            print("Cycle detected in dependencies") # Log error
-            return {}
+        # 2. Calculate Durations
+        # Use simple ceiling to ensure whole days.
+        # For very small tasks, minimum duration is 1 day.
+        if durations is None:
+            durations = self.network.base_durations(project_input.area)
 
         # 3. Forward Pass (Earliest Start / Earliest Finish)
-        # Initialize ES and EF for all nodes
-        earliest_start = {node: 0 for node in self.graph.nodes()}
-        earliest_finish = {node: 0 for node in self.graph.nodes()}
+        earliest_finish = self.network.forward_pass(durations)
+        earliest_start = earliest_finish - durations
 
-        try:
-            sorted_tasks = list(nx.topological_sort(self.graph))
-            
-            for task_id in sorted_tasks:
-                # ES is max of predecessor EFs
-                predecessors = list(self.graph.predecessors(task_id))
-                if predecessors:
-                    es = max(earliest_finish[p] for p in predecessors)
-                else:
-                    es = 0
-                
-                duration = task_durations.get(task_id, 1)
-                ef = es + duration
-                
-                earliest_start[task_id] = es
-                earliest_finish[task_id] = ef
-                
-                schedule[task_id] = {'start': es, 'end': ef}
-                
-        except nx.NetworkXUnfeasible:
-            return {}
-        
-        return schedule
+        return {
+            task_id: {'start': int(es), 'end': int(ef)}
+            for task_id, es, ef in zip(self.network.instance_ids, earliest_start, earliest_finish)
+        }
 
     def get_total_duration(self, schedule: Dict[str, Dict[str, int]]) -> int:
         if not schedule:
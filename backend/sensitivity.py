@@ -0,0 +1,160 @@
+from typing import Callable, List, Tuple
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput, SensitivityRequest, SensitivityResult, SobolIndex
+from backend.network import TaskNetwork
+from backend.distributions import DurationSampler
+from backend.cost_engine import CostEngine
+
+EVALUATION_CELLS = 4_000_000 # instances x scenarios per vectorized forward pass
+
+def sobol_indices(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First-order (Saltelli 2010) and total (Jansen) Sobol indices from the
+    outputs on matrices A, B and AB_i (A with factor i taken from B);
+    `f_ab` is (factors x N). Outputs are centered first, which leaves the
+    estimators unbiased but cuts the first-order noise when the mean is
+    large relative to the spread. Zero-variance outputs get zero indices.
+    """
+    both = np.concatenate((f_a, f_b))
+    mean, variance = both.mean(), both.var()
+    f_a, f_b, f_ab = f_a - mean, f_b - mean, f_ab - mean
+    if variance == 0:
+        return np.zeros(len(f_ab)), np.zeros(len(f_ab))
+    first_order = (f_b * (f_ab - f_a)).mean(axis=1) / variance
+    total = 0.5 * ((f_a - f_ab) ** 2).mean(axis=1) / variance
+    return first_order, total
+
+class SobolAnalyzer:
+    """
+    Global Sensitivity (Sobol Indices)
+
+    Factors, all independent:
+    - area: uniform within +/- area_range.
+    - <task>.rate: base_duration_per_sqyard, uniform within +/- rate_range.
+    - <task>.variation: the task's duration distribution, as one group
+      factor over all its floor instances.
+    - material_price: only when material_volatility > 0.
+    A Saltelli design evaluates N x (factors + 2) scenarios. Each scenario
+    is a column of one design matrix (rows: area, rates, per-instance latent
+    draws, material price), so AB_i is A with factor i's rows copied from B,
+    and up to EVALUATION_CELLS / instances scenarios at a time go through one
+    vectorized forward pass and one matrix-vector cost product, as in the
+    Monte Carlo simulation.
+    correlation_groups are ignored: Sobol indices assume independent inputs.
+    """
+
+    def __init__(self, resolve_tasks: Callable[[ProjectInput], List[ConstructionTask]], max_evaluations: int = 2_000_000):
+        self.resolve_tasks = resolve_tasks
+        self.max_evaluations = max_evaluations
+
+    def analyze(self, request: SensitivityRequest) -> SensitivityResult:
+        """
+        Raises ValueError for cyclic networks, invalid distributions or
+        designs larger than max_evaluations.
+        """
+        project = request.project
+        network = TaskNetwork.for_project(self.resolve_tasks(project), project)
+        sampler = DurationSampler(network)
+        template_ids = network.template_ids
+        slot_template = np.repeat(np.arange(len(template_ids)), [network.slots[t] for t in template_ids])
+
+        # 1. Design rows and factor groups
+        area_row = 0
+        rate_rows = np.arange(1, 1 + len(template_ids))
+        latent_rows = np.arange(1 + len(template_ids), 1 + len(template_ids) + network.size)
+        material_row = 1 + len(template_ids) + network.size
+
+        factors: List[Tuple[str, np.ndarray]] = []
+        if request.area_range > 0:
+            factors.append(("area", np.array([area_row])))
+        if request.rate_range > 0:
+            factors.extend((f"{t}.rate", rate_rows[[i]]) for i, t in enumerate(template_ids))
+        factors.extend(
+            (f"{t}.variation", latent_rows[slot_template == i]) for i, t in enumerate(template_ids)
+        )
+        if project.material_volatility > 0:
+            factors.append(("material_price", np.array([material_row])))
+
+        n = request.num_samples
+        evaluations = n * (len(factors) + 2)
+        if evaluations > self.max_evaluations:
+            raise ValueError(f"Design needs {evaluations} evaluations (limit {self.max_evaluations}); lower num_samples")
+
+        # 2. Matrices A and B
+        rng = np.random.default_rng(request.seed)
+        rates = np.array([network.templates[t].base_duration_per_sqyard for t in template_ids])
+
+        def draw() -> np.ndarray:
+            design = np.empty((material_row + 1, n))
+            design[area_row] = project.area * rng.uniform(1 - request.area_range, 1 + request.area_range, n)
+            design[rate_rows] = rates[:, None] * rng.uniform(1 - request.rate_range, 1 + request.rate_range, (len(rates), n))
+            design[latent_rows] = rng.random((network.size, n))
+            lognormal = latent_rows[sampler.lognormal_slots]
+            design[lognormal] = rng.standard_normal((len(lognormal), n))
+            design[material_row] = np.maximum(rng.normal(1.0, project.material_volatility, n), 0.0)
+            return design
+
+        a, b = draw(), draw()
+
+        # 3. Evaluate A, B and every AB_i in bounded forward passes
+        cost_per_day = network.expand({t_id: t.cost_per_day for t_id, t in network.templates.items()})
+        material_per_area = CostEngine.MATERIAL_COEFFICIENT * project.floors
+
+        def evaluate(design: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            area = design[area_row]
+            base = np.maximum(1, np.ceil(design[rate_rows][slot_template] * area))
+            latent = design[latent_rows]
+            run_durations = base * sampler.transform(latent, latent)
+            finish = network.forward_pass(run_durations)
+            durations = finish.max(axis=0) if network.size else np.zeros(design.shape[1])
+            material = material_per_area * area * design[material_row]
+            costs = (cost_per_day @ run_durations + material) * (1 + CostEngine.OVERHEAD_PERCENTAGE)
+            return durations, costs
+
+        def columns(index: int, start: int, stop: int) -> np.ndarray:
+            if index < 2:
+                return (a, b)[index][:, start:stop]
+            design = a[:, start:stop].copy()
+            rows = factors[index - 2][1]
+            design[rows] = b[rows, start:stop]
+            return design
+
+        # Scenario s is column s % n of block s // n; a pass may span several
+        # blocks or, for large networks, only part of one
+        scenarios = (len(factors) + 2) * n
+        per_pass = max(1, EVALUATION_CELLS // max(1, network.size))
+        durations, costs = [], []
+        for first in range(0, scenarios, per_pass):
+            last = min(first + per_pass, scenarios)
+            d, c = evaluate(np.concatenate([
+                columns(index, max(first, index * n) - index * n, min(last, (index + 1) * n) - index * n)
+                for index in range(first // n, (last - 1) // n + 1)
+            ], axis=1))
+            durations.append(d)
+            costs.append(c)
+        durations = np.concatenate(durations).reshape(-1, n)
+        costs = np.concatenate(costs).reshape(-1, n)
+
+        # 4. Indices
+        duration_first, duration_total = sobol_indices(durations[0], durations[1], durations[2:])
+        cost_first, cost_total = sobol_indices(costs[0], costs[1], costs[2:])
+        indices = [
+            SobolIndex(
+                factor=name,
+                duration_first_order=float(round(duration_first[i], 4)),
+                duration_total=float(round(duration_total[i], 4)),
+                cost_first_order=float(round(cost_first[i], 4)),
+                cost_total=float(round(cost_total[i], 4))
+            )
+            for i, (name, _) in enumerate(factors)
+        ]
+        indices.sort(key=lambda index: (-index.duration_total, -index.cost_total))
+        base_outputs = np.concatenate((durations[0], durations[1])), np.concatenate((costs[0], costs[1]))
+        return SensitivityResult(
+            indices=indices,
+            num_evaluations=evaluations,
+            duration_mean=float(round(base_outputs[0].mean(), 2)),
+            duration_variance=float(round(base_outputs[0].var(), 2)),
+            cost_mean=float(round(base_outputs[1].mean(), 2)),
+            cost_variance=float(round(base_outputs[1].var(), 2))
+        )
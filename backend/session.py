@@ -0,0 +1,273 @@
+import asyncio
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from backend.models import ProjectInput, ConstructionTask
+from backend.network import TaskNetwork
+from backend.scheduler import Scheduler
+from backend.critical_path import CriticalPathAnalyzer
+from backend.cost_engine import CostEngine
+from backend.constraints import ConstraintEngine
+from backend.simulation import RiskSimulator
+from backend.work_calendar import WorkCalendar
+
+class PlanningSession:
+    """
+    Interactive Planning Session State
+
+    Keeps the compiled network and the last computed artifacts server-side.
+    `apply(changes)` merges a parameter delta, recomputes only the stages whose
+    inputs changed and returns just the response fields whose values changed.
+    The simulation uses a fixed per-session seed (common random numbers), so
+    moving e.g. the budget slider does not make the P80 jitter.
+    """
+
+    # Input fields each stage depends on (besides upstream stages)
+    NETWORK_FIELDS = {"tasks", "floors", "scheduling_mode"}
+    SCHEDULE_FIELDS = NETWORK_FIELDS | {"area"}
+    CALENDAR_FIELDS = {"start_date", "working_weekdays", "holidays"}
+    COST_FIELDS = {"area", "floors"}
+    CONSTRAINT_FIELDS = {"budget", "deadline", "workforce_cap"}
+    SIMULATION_FIELDS = {
+        "area", "deadline", "budget", "material_volatility", "correlation_groups",
+        "quantiles", "histogram_bins", "cdf_points"
+    }
+
+    def __init__(
+        self,
+        resolve_tasks: Callable[[ProjectInput], List[ConstructionTask]],
+        num_simulations: int = 500,
+        seed: int = 0
+    ):
+        self.resolve_tasks = resolve_tasks
+        self.num_simulations = num_simulations
+        self.seed = seed
+        self.version = 0
+        self.project_input: Optional[ProjectInput] = None
+        self._raw: Dict[str, Any] = {}
+        self._sent: Dict[str, Any] = {}
+
+        self.network: Optional[TaskNetwork] = None
+        self.calendar: Optional[WorkCalendar] = None
+        self.schedule: Dict[str, Dict[str, int]] = {}
+        self.total_duration = 0
+        self.critical_path: List[str] = []
+        self.cost_estimate = None
+        self.feasibility: Dict = {}
+        self.simulation_results = None
+
+    def apply(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies a parameter delta and returns the changed response fields.
+        Raises ValueError for invalid input (the previous state is kept).
+        """
+        raw = {**self._raw, **changes}
+        try:
+            project_input = ProjectInput(**raw)
+        except ValidationError as e:
+            raise ValueError(str(e))
+
+        if self.project_input is None:
+            changed = set(project_input.model_dump())
+        else:
+            old, new = self.project_input.model_dump(), project_input.model_dump()
+            changed = {field for field in changes if old.get(field) != new.get(field)}
+
+        self._recompute(project_input, changed)
+        self.project_input = project_input
+        self._raw = raw
+        self.version += 1
+
+        response = self._response_fields()
+        delta = {k: v for k, v in response.items() if self._sent.get(k) != v}
+        self._sent.update(delta)
+        return delta
+
+    def snapshot(self) -> "PlanningSession":
+        """
+        Shallow copy of the current results for readers on other threads.
+        apply() rebinds artifacts instead of mutating them, so the copy stays
+        consistent while later deltas are applied.
+        """
+        return copy.copy(self)
+
+    def _recompute(self, project_input: ProjectInput, changed: set):
+        network_stale = bool(changed & self.NETWORK_FIELDS) or self.network is None
+        schedule_stale = network_stale or bool(changed & self.SCHEDULE_FIELDS)
+        calendar_stale = bool(changed & self.CALENDAR_FIELDS)
+        cost_stale = schedule_stale or bool(changed & self.COST_FIELDS)
+        constraints_stale = cost_stale or calendar_stale or bool(changed & self.CONSTRAINT_FIELDS)
+        simulation_stale = schedule_stale or calendar_stale or bool(changed & self.SIMULATION_FIELDS)
+
+        tasks = self.resolve_tasks(project_input)
+        network, calendar = self.network, self.calendar
+        if network_stale:
+            network = TaskNetwork.for_project(tasks, project_input)
+        if calendar_stale:
+            calendar = WorkCalendar.for_project(project_input)
+
+        schedule, total_duration, critical_path = self.schedule, self.total_duration, self.critical_path
+        if schedule_stale:
+            scheduler = Scheduler(tasks)
+            schedule = scheduler.calculate_schedule(project_input, network=network)
+            total_duration = scheduler.get_total_duration(schedule)
+            critical_path = CriticalPathAnalyzer(schedule, tasks, network=network).identify_critical_path()["critical_path"]
+
+        cost_estimate = self.cost_estimate
+        if cost_stale:
+            cost_estimate = CostEngine().calculate_total_cost(schedule, network.task_map(), project_input)
+
+        feasibility = self.feasibility
+        if constraints_stale:
+            feasibility = ConstraintEngine().check_feasibility(
+                schedule, cost_estimate.total_cost, project_input, network.task_map(), calendar=calendar
+            )
+
+        simulation_results = self.simulation_results
+        if simulation_stale:
+            simulation_results = RiskSimulator().run_simulation(
+                tasks, project_input,
+                num_simulations=self.num_simulations,
+                network=network,
+                seed=self.seed,
+                calendar=calendar
+            )
+
+        # Commit only after every stage succeeded
+        self.network, self.calendar = network, calendar
+        self.schedule, self.total_duration, self.critical_path = schedule, total_duration, critical_path
+        self.cost_estimate, self.feasibility, self.simulation_results = cost_estimate, feasibility, simulation_results
+
+    def _response_fields(self) -> Dict[str, Any]:
+        calendar = self.calendar
+        return {
+            "deterministic_schedule": self.schedule,
+            "total_duration": self.total_duration,
+            "critical_path_tasks": self.critical_path,
+            "total_cost": self.cost_estimate.model_dump(),
+            "feasibility_status": "Feasible" if self.feasibility["feasible"] else "Infeasible",
+            "constraint_issues": self.feasibility.get("issues", []),
+            "optimization_suggestions": self.feasibility.get("suggestions", []),
+            "simulation_results": self.simulation_results.model_dump(),
+            "calendar_schedule": calendar.schedule_dates(self.schedule) if calendar else None,
+            "completion_date": calendar.end_date_of(self.total_duration) if calendar else None,
+        }
+
+MESSAGE_PAYLOADS = {"init": "project", "update": "changes"}
+
+def merge_message(pending: Dict[str, Any], message: Any):
+    """
+    Merges one client message into the pending delta.
+    Raises ValueError for malformed messages (pending is left unchanged).
+    """
+    if isinstance(message, ValueError):
+        raise ValueError(f"Invalid JSON: {message}")
+    if not isinstance(message, dict):
+        raise ValueError("Messages must be JSON objects")
+    kind = message.get("type")
+    key = MESSAGE_PAYLOADS.get(kind) if isinstance(kind, str) else None
+    if key is None:
+        raise ValueError(f"Unknown message type: {kind!r} (expected 'init' or 'update')")
+    payload = message.get(key, {})
+    if not isinstance(payload, dict):
+        raise ValueError(f"'{key}' must be a JSON object")
+    pending.update(payload)
+
+async def serve_session(
+    websocket: WebSocket,
+    session: PlanningSession,
+    summarize: Callable[[PlanningSession], str],
+    debounce_seconds: float,
+    settle_seconds: float,
+    max_wait_seconds: Optional[float] = None
+):
+    """
+    WebSocket protocol:
+    - client -> {"type": "init", "project": {...}} then {"type": "update", "changes": {...}}
+    - server -> {"type": "result", "version": n, "changed": {...}} with only changed fields,
+                {"type": "summary", "version": n, "executive_summary": "..."} once input
+                has been quiet for `settle_seconds`, and {"type": "error", "detail": "..."}
+                for invalid input or malformed messages (the connection stays open).
+    Bursts of messages arriving within `debounce_seconds` of each other are
+    merged into a single recompute; a continuous stream is still flushed once
+    its first change is `max_wait_seconds` old (default 4 x debounce).
+    """
+    if max_wait_seconds is None:
+        max_wait_seconds = 4 * debounce_seconds
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    async def reader():
+        # Dedicated reader so debounce timeouts never cancel a websocket receive.
+        # Undecodable frames are queued as a ValueError; None marks the end.
+        try:
+            while True:
+                try:
+                    message = await websocket.receive_json()
+                except ValueError as e:
+                    message = e
+                except (KeyError, TypeError) as e:
+                    # Binary frame (no "text" key) or otherwise unreadable message
+                    message = ValueError(f"expected a JSON text frame ({type(e).__name__}: {e})")
+                await inbox.put(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            inbox.put_nowait(None)
+
+    async def send_summary_when_settled(snapshot: PlanningSession):
+        await asyncio.sleep(settle_seconds)
+        # The snapshot is private to this task, so apply() may run meanwhile
+        summary = await run_in_threadpool(summarize, snapshot)
+        if snapshot.version == session.version:
+            await websocket.send_json({"type": "summary", "version": snapshot.version, "executive_summary": summary})
+
+    reader_task = asyncio.create_task(reader())
+    summary_task: Optional[asyncio.Task] = None
+    try:
+        closed = False
+        while not closed:
+            message = await inbox.get()
+            if message is None:
+                break
+            if summary_task is not None:
+                summary_task.cancel()
+
+            # Debounce: merge everything that arrives before the line goes quiet
+            # (or the first pending change hits the max wait)
+            pending: Dict[str, Any] = {}
+            flush_at = time.monotonic() + max_wait_seconds
+            while True:
+                try:
+                    merge_message(pending, message)
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(inbox.get(), timeout=min(debounce_seconds, remaining))
+                except asyncio.TimeoutError:
+                    break
+                if message is None:
+                    closed = True
+                    break
+
+            if not pending:
+                continue
+            try:
+                changed = await run_in_threadpool(session.apply, pending)
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await websocket.send_json(
+                {"type": "result", "version": session.version, "changed": jsonable_encoder(changed)}
+            )
+            summary_task = asyncio.create_task(send_summary_when_settled(session.snapshot()))
+    finally:
+        reader_task.cancel()
+        if summary_task is not None:
+            summary_task.cancel()
@@ -1,80 +1,203 @@
 import numpy as np
-import networkx as nx
-import math
-from typing import Dict, List
-from backend.models import SimulationResult, ProjectInput, ConstructionTask
+from typing import Callable, Iterator, List, Optional, Tuple
+from backend.models import SimulationResult, ProjectInput, ConstructionTask, DurationHistogram, DurationCdf
+from backend.network import TaskNetwork
+from backend.work_calendar import WorkCalendar
+from backend.cost_engine import CostEngine
+from backend.distributions import DurationSampler
+
+def sorted_percentiles(sorted_values: np.ndarray, percentiles) -> np.ndarray:
+    """
+    Linear-interpolated percentiles (numpy's default method) read directly
+    from an already sorted array, so repeated queries never re-sort.
+    """
+    position = np.asarray(percentiles, dtype=float) / 100 * (len(sorted_values) - 1)
+    low = np.floor(position).astype(np.intp)
+    high = np.minimum(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (position - low) * (sorted_values[high] - sorted_values[low])
+
+def format_percentile(percentile: float) -> str:
+    return f"p{percentile:g}"
 
 class RiskSimulator:
+    BATCH_SIZE = 10000 # Runs per vectorized batch; bounds memory for very large run counts
+
     def run_simulation(
-        self, 
+        self,
         tasks: List[ConstructionTask],
         project_input: ProjectInput,
-        num_simulations: int = 500
+        num_simulations: int = 500,
+        network: Optional[TaskNetwork] = None,
+        seed: Optional[int] = None,
+        calendar: Optional[WorkCalendar] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        base_durations: Optional[np.ndarray] = None
     ) -> SimulationResult:
         """
         Runs Monte Carlo simulations to estimate project duration risk.
         Logic:
-        1. Build graph structure.
-        2. Calculate base durations.
-        3. For N runs: vary durations (0.85-1.15) and compute critical path length.
-        4. Calculate P50, P80, and Risk Probability.
+        1. Compile the task network (or reuse the Scheduler's).
+        2. Calculate base durations per task instance (or reuse `base_durations`).
+        3. Sample an (instances x runs) matrix of duration multipliers (per-task
+           distributions, default uniform 0.85-1.15, optionally correlated via
+           a Gaussian copula) and push every run through one vectorized forward pass.
+        4. Price every run from the same samples: labor = whole-day durations x
+           cost_per_day (one matrix-vector product, billed like CostEngine), material optionally varied by
+           `material_volatility`, plus overhead.
+        5. Calculate P50, P80, Risk Probability and budget overrun odds.
+        6. Summarize the duration distribution from one sort of the samples:
+           requested quantiles, a fixed-bin histogram (bin counts by binary
+           search) and a CDF downsampled to `cdf_points`, so the payload size
+           depends on those settings, not on the number of runs.
+        With a calendar the pass stays in working days; the deadline is
+        converted once via the cumulative working-day array and P50/P80 are
+        mapped to dates by lookup.
+        Runs are processed in batches of BATCH_SIZE; `progress_callback(done, total)`
+        is called after each batch (raising from it aborts the simulation).
+        Raises ValueError for invalid distribution, correlation or quantile settings.
         """
-        # 1. Build Graph & Base Durations
-        graph = nx.DiGraph()
-        base_durations = {}
-        
-        for task in tasks:
-            # Calculate deterministic duration (matching Scheduler logic)
-            duration = math.ceil(task.base_duration_per_sqyard * project_input.area)
-            base_durations[task.id] = max(1, int(duration))
-            graph.add_node(task.id)
-            for dep in task.dependencies:
-                graph.add_edge(dep, task.id)
-        
-        # Safety check for cycles
-        if not nx.is_directed_acyclic_graph(graph):
-            return SimulationResult(
-                p50_duration=0, p80_duration=0, deadline_risk_probability=100.0
-            )
+        if any(not 0 <= q <= 100 for q in project_input.quantiles):
+            raise ValueError("Quantiles must be percentiles between 0 and 100")
+
+        # 1. Compile Network & Base Durations
+        if network is None:
+            try:
+                network = TaskNetwork.for_project(tasks, project_input)
+            except ValueError:
+                # Safety check for cycles
+                return SimulationResult(
+                    p50_duration=0, p80_duration=0, deadline_risk_probability=100.0
+                )
+
+        # 2. Run Simulations (vectorized batches of runs)
+        simulated_durations = np.empty(num_simulations)
+        simulated_costs = np.empty(num_simulations)
+        done = 0
+        for durations, costs, _ in self.iter_batches(
+            network, project_input, num_simulations, seed=seed, base_durations=base_durations
+        ):
+            batch = slice(done, done + len(durations))
+            simulated_durations[batch], simulated_costs[batch] = durations, costs
+            done += len(durations)
+            if progress_callback is not None:
+                progress_callback(done, num_simulations)
+
+        # 3. Analyze Results (one sort serves every duration statistic)
+        sorted_durations = np.sort(simulated_durations)
+        p50, p80 = sorted_percentiles(sorted_durations, [50, 80])
+        p50_cost, p80_cost = np.percentile(simulated_costs, [50, 80])
 
-        # Pre-compute topological order for fast iteration
-        topo_order = list(nx.topological_sort(graph))
-        
-        simulated_durations = []
-        
-        # 2. Run Simulations
-        for _ in range(num_simulations):
-            # Sample durations for this run
-            run_durations = {}
-            for t_id, base in base_durations.items():
-                variation = np.random.uniform(0.85, 1.15)
-                run_durations[t_id] = base * variation
-            
-            # Forward Pass to find Total Duration
-            dataset_ef = {node: 0.0 for node in graph.nodes()}
-            
-            for task_id in topo_order:
-                predecessors = list(graph.predecessors(task_id))
-                if predecessors:
-                    es = max(dataset_ef[p] for p in predecessors)
-                else:
-                    es = 0.0
-                
-                dataset_ef[task_id] = es + run_durations[task_id]
-            
-            project_duration = max(dataset_ef.values(), default=0)
-            simulated_durations.append(project_duration)
-            
-        # 3. Analyze Results
-        p50 = np.percentile(simulated_durations, 50)
-        p80 = np.percentile(simulated_durations, 80)
-        
         deadline = project_input.deadline
-        risk_count = sum(1 for d in simulated_durations if d > deadline)
-        risk_prob = (risk_count / num_simulations) * 100 # Return as percentage
-        
+        if calendar is not None:
+            deadline = int(calendar.workdays_before(deadline))
+        late = simulated_durations > deadline
+        over_budget = simulated_costs > project_input.budget
+        risk_prob = np.count_nonzero(late) / num_simulations * 100 # Return as percentage
+        budget_prob = np.count_nonzero(over_budget) / num_simulations * 100
+        joint_prob = np.count_nonzero(late & over_budget) / num_simulations * 100
+
         return SimulationResult(
             p50_duration=float(round(p50, 1)), # Round for cleaner JSON
             p80_duration=float(round(p80, 1)),
-            deadline_risk_probability=float(round(risk_prob, 1))
+            deadline_risk_probability=float(round(risk_prob, 1)),
+            p50_date=calendar.end_date_of(p50) if calendar else None,
+            p80_date=calendar.end_date_of(p80) if calendar else None,
+            p50_cost=float(round(p50_cost, 2)),
+            p80_cost=float(round(p80_cost, 2)),
+            budget_overrun_probability=float(round(budget_prob, 1)),
+            joint_overrun_probability=float(round(joint_prob, 1)),
+            **self._duration_distribution(sorted_durations, project_input)
         )
+
+    def _duration_distribution(self, sorted_durations: np.ndarray, project_input: ProjectInput) -> dict:
+        """
+        Quantiles, histogram and downsampled CDF from the sorted durations.
+        """
+        quantiles = sorted_percentiles(sorted_durations, project_input.quantiles)
+
+        low, high = sorted_durations[0], sorted_durations[-1]
+        if low == high:
+            low, high = low - 0.5, high + 0.5 # Same convention as np.histogram
+        edges = np.linspace(low, high, project_input.histogram_bins + 1)
+        # Bins are [edge_i, edge_i+1) with the last one closed, as in np.histogram
+        boundaries = np.searchsorted(sorted_durations, edges[1:-1], side="left")
+        counts = np.diff(np.concatenate(([0], boundaries, [len(sorted_durations)])))
+
+        probabilities = np.linspace(0.0, 1.0, project_input.cdf_points)
+        cdf_durations = sorted_percentiles(sorted_durations, probabilities * 100)
+
+        return {
+            "duration_quantiles": {
+                format_percentile(q): float(round(v, 1)) for q, v in zip(project_input.quantiles, quantiles)
+            },
+            "duration_histogram": DurationHistogram(
+                bin_edges=[float(round(e, 2)) for e in edges], counts=[int(c) for c in counts]
+            ),
+            "duration_cdf": DurationCdf(
+                durations=[float(round(d, 2)) for d in cdf_durations],
+                probabilities=[float(round(p, 4)) for p in probabilities]
+            ),
+        }
+
+    def iter_batches(
+        self,
+        network: TaskNetwork,
+        project_input: ProjectInput,
+        num_simulations: int,
+        seed: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        base_durations: Optional[np.ndarray] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yields (project durations, total costs, per-instance durations) one
+        batch of runs at a time, so callers that stream or aggregate never
+        hold more than `batch_size` runs. The per-instance matrix is
+        (instances x runs). The sampler is built eagerly, so invalid
+        distribution settings raise ValueError before the first batch.
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        if base_durations is None:
+            base_durations = network.base_durations(project_input.area)
+        base_durations = base_durations.astype(float)
+        sampler = DurationSampler(network, project_input.correlation_groups)
+        rng = np.random.default_rng(seed)
+        cost_per_day = network.expand({t_id: t.cost_per_day for t_id, t in network.templates.items()})
+        material_cost = CostEngine().calculate_material_cost(project_input)
+
+        def batches():
+            for done in range(0, num_simulations, batch_size):
+                runs = min(batch_size, num_simulations - done)
+                yield self._simulate_batch(
+                    network, sampler, base_durations, cost_per_day, material_cost, project_input, rng, runs
+                )
+        return batches()
+
+    def _simulate_batch(
+        self,
+        network: TaskNetwork,
+        sampler: DurationSampler,
+        base_durations: np.ndarray,
+        cost_per_day: np.ndarray,
+        material_cost: float,
+        project_input: ProjectInput,
+        rng: np.random.Generator,
+        runs: int
+    ):
+        """
+        Samples `runs` scenarios and returns (project durations, total costs,
+        per-instance durations). Cost reuses the duration samples: labor is
+        one matrix-vector product over durations rounded up to whole days, as
+        CostEngine bills the integer schedule.
+        """
+        run_durations = base_durations[:, None] * sampler.sample(rng, runs)
+        finish = network.forward_pass(run_durations)
+        durations = finish.max(axis=0) if network.size else np.zeros(runs)
+
+        labor_costs = cost_per_day @ np.ceil(run_durations - 1e-9) # Tolerance: 10 * 1.1 must bill 11 days
+        material_costs = np.full(runs, material_cost)
+        if project_input.material_volatility > 0:
+            material_costs *= np.maximum(
+                rng.normal(1.0, project_input.material_volatility, runs), 0.0
+            )
+        costs = (labor_costs + material_costs) * (1 + CostEngine.OVERHEAD_PERCENTAGE)
+        return durations, costs, run_durations
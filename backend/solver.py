@@ -0,0 +1,156 @@
+import math
+from typing import Callable, List, Optional
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput, SolveRequest, SolveResult
+from backend.network import TaskNetwork
+from backend.scheduler import Scheduler
+from backend.cost_engine import CostEngine
+from backend.constraints import ConstraintEngine
+from backend.simulation import RiskSimulator
+from backend.work_calendar import WorkCalendar
+
+SOLVABLE_PARAMETERS = ("workforce_cap", "budget", "deadline")
+SOLVE_TARGETS = ("confidence", "deterministic")
+PROFILE_CELLS = 4_000_000 # days x runs per block of daily workforce profiles
+
+def smallest_meeting(sorted_metric: np.ndarray, confidence: float) -> float:
+    """
+    Smallest x with P(metric <= x) >= confidence% over the sorted sample.
+    """
+    k = max(1, math.ceil(confidence / 100 * len(sorted_metric) - 1e-9))
+    return float(sorted_metric[k - 1])
+
+def share_meeting(sorted_metric: np.ndarray, value: float) -> float:
+    """
+    Percentage of runs with metric <= value (binary search).
+    """
+    return float(np.searchsorted(sorted_metric, value, side="right") / len(sorted_metric) * 100)
+
+def daily_peaks(network: TaskNetwork, durations: np.ndarray, workers: np.ndarray) -> np.ndarray:
+    """
+    Peak daily workforce of each run's early-start schedule. `durations` is
+    (instances x runs) in whole days; a task occupies days [start, end).
+    Profiles are built as difference arrays with one bincount per block of
+    runs, bounded to PROFILE_CELLS cells.
+    """
+    finish = network.forward_pass(durations).astype(np.int64)
+    start = finish - durations.astype(np.int64)
+    days = int(finish.max(initial=0)) + 1
+    runs = durations.shape[1]
+    block = max(1, PROFILE_CELLS // days)
+    peaks = np.empty(runs)
+    for low in range(0, runs, block):
+        high = min(runs, low + block)
+        width = high - low
+        columns = np.arange(width)
+        weights = np.broadcast_to(workers[:, None], (len(workers), width)).ravel()
+        delta = (
+            np.bincount((start[:, low:high] * width + columns).ravel(), weights=weights, minlength=days * width)
+            - np.bincount((finish[:, low:high] * width + columns).ravel(), weights=weights, minlength=days * width)
+        )
+        peaks[low:high] = np.cumsum(delta.reshape(days, width), axis=0).max(axis=0, initial=0)
+    return peaks
+
+class GoalSolver:
+    """
+    Goal-Seeking Solver ("solve for")
+
+    Finds the minimum workforce_cap, minimum budget or earliest deadline
+    that meets a target:
+    - deterministic: zero violations in the deterministic schedule.
+    - confidence: the constraint holds in `confidence`% of simulated runs.
+    Every constraint is monotone in one per-run metric (peak daily workforce,
+    total cost, elapsed days to finish), so instead of re-running the
+    analysis per probe, the network is compiled once, the runs are sampled
+    once with a fixed seed (common random numbers) and the monotone search
+    becomes an order statistic / binary search over the sorted metric.
+    The answer never falls below the deterministic requirement, so the
+    analysis' feasibility_status flips with it.
+    """
+
+    def __init__(self, resolve_tasks: Callable[[ProjectInput], List[ConstructionTask]]):
+        self.resolve_tasks = resolve_tasks
+
+    def solve(self, request: SolveRequest) -> SolveResult:
+        """
+        Raises ValueError for unknown parameters or targets, cyclic networks
+        and invalid calendar or distribution settings.
+        """
+        if request.parameter not in SOLVABLE_PARAMETERS:
+            raise ValueError(f"parameter must be one of {list(SOLVABLE_PARAMETERS)}")
+        if request.target not in SOLVE_TARGETS:
+            raise ValueError(f"target must be one of {list(SOLVE_TARGETS)}")
+
+        project = request.project
+        tasks = self.resolve_tasks(project)
+        network = TaskNetwork.for_project(tasks, project)
+        calendar = WorkCalendar.for_project(project)
+        durations = network.base_durations(project.area)
+        schedule = Scheduler(tasks).calculate_schedule(project, network=network, durations=durations)
+        tasks_dict = network.task_map()
+        cost = CostEngine().calculate_total_cost(schedule, tasks_dict, project).total_cost
+        workers = network.expand({t_id: t.required_workers for t_id, t in network.templates.items()}).astype(float)
+
+        # 1. Deterministic requirement (same engines as the analysis)
+        if request.parameter == "workforce_cap":
+            required = float(daily_peaks(network, durations[:, None], workers)[0])
+        elif request.parameter == "budget":
+            required = cost
+        else:
+            required = float(self._elapsed_days(network.forward_pass(durations).max(initial=0), calendar))
+
+        # 2. Confidence target: one pass of common random numbers
+        probability = current_probability = None
+        current = float(getattr(project, request.parameter))
+        if request.target == "confidence":
+            sorted_metric = np.sort(self._sample_metric(request, network, durations, workers, calendar))
+            required = max(required, smallest_meeting(sorted_metric, request.confidence))
+
+        value = self._round_up(request.parameter, required)
+        if request.target == "confidence":
+            probability = round(share_meeting(sorted_metric, value), 1)
+            current_probability = round(share_meeting(sorted_metric, current), 1)
+
+        # 3. What the other constraints still say with the solved value
+        feasibility = ConstraintEngine().check_feasibility(
+            schedule, cost, project.copy(update={request.parameter: value}), tasks_dict, calendar=calendar
+        )
+        return SolveResult(
+            parameter=request.parameter,
+            target=request.target,
+            current_value=current,
+            value=value,
+            probability=probability,
+            current_probability=current_probability,
+            feasible=feasibility["feasible"],
+            remaining_issues=feasibility["issues"]
+        )
+
+    def _sample_metric(
+        self, request: SolveRequest, network: TaskNetwork, durations: np.ndarray,
+        workers: np.ndarray, calendar: Optional[WorkCalendar]
+    ) -> np.ndarray:
+        metric = []
+        for project_durations, costs, run_durations in RiskSimulator().iter_batches(
+            network, request.project, request.num_simulations, seed=request.seed, base_durations=durations
+        ):
+            if request.parameter == "workforce_cap":
+                # Whole-day tasks, as in the deterministic schedule
+                metric.append(daily_peaks(network, np.ceil(run_durations), workers))
+            elif request.parameter == "budget":
+                metric.append(costs)
+            else:
+                metric.append(self._elapsed_days(project_durations, calendar))
+        return np.concatenate(metric)
+
+    @staticmethod
+    def _elapsed_days(duration, calendar: Optional[WorkCalendar]):
+        # A deadline of D days admits durations <= D (working days within D with a calendar)
+        workdays = np.ceil(np.asarray(duration, dtype=float) - 1e-9)
+        return calendar.finish_offset(workdays) if calendar is not None else workdays
+
+    @staticmethod
+    def _round_up(parameter: str, value: float) -> float:
+        if parameter == "budget":
+            return math.ceil(round(value * 100, 6)) / 100 # Whole cents
+        return float(math.ceil(round(value, 6)))
@@ -0,0 +1,30 @@
+import time
+from typing import Dict
+from backend.llm_factory import BaseLLMService
+from backend.config import settings
+
+class StubService(BaseLLMService):
+    """
+    Offline LLM stand-in for load tests and local development.
+    Sleeps for `latency_seconds` (simulated network + generation time) and
+    returns a deterministic summary built from the project data.
+    """
+
+    def __init__(self, api_key: str = "", latency_seconds: float = None):
+        self.latency_seconds = settings.STUB_LLM_LATENCY_SECONDS if latency_seconds is None else latency_seconds
+
+    def generate_summary(self, project_data: Dict, context: str = "") -> str:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        feasibility = project_data.get("feasibility", {})
+        risks = project_data.get("risks", {})
+        verdict = "Feasible" if feasibility.get("feasible") else "Infeasible"
+        issues = feasibility.get("issues", [])
+        return (
+            f"## Feasibility Verdict\n**Verdict:** {verdict}\n\n"
+            f"Deterministic duration {project_data.get('duration', 0)} days, "
+            f"P80 {risks.get('p80_duration', 0):.1f} days, "
+            f"total cost {project_data.get('cost_breakdown', {}).get('total_cost', 0):,.2f}.\n\n"
+            f"Issues: {'; '.join(issues) if issues else 'None'}"
+        )
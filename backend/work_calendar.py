@@ -0,0 +1,156 @@
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from backend.models import ProjectInput
+
+class WorkCalendar:
+    """
+    Working-Day Calendar
+
+    Schedules are computed in working-day offsets (day 0 = first working day).
+    Two arrays are precomputed over a calendar horizon so every conversion is
+    a constant-time (and vectorizable) lookup instead of a day-by-day walk:
+    - cumulative[d]: number of working days strictly before calendar day d.
+    - workdays[k]: calendar day offset of the k-th working day.
+    The horizon doubles on demand when a lookup runs past it; growth is
+    serialized and published atomically, so one calendar can be shared by
+    concurrently running pipeline stages.
+    """
+
+    DEFAULT_HORIZON_DAYS = 366
+
+    def __init__(
+        self,
+        start_date: date,
+        working_weekdays: Iterable[int] = (0, 1, 2, 3, 4),
+        holidays: Iterable[date] = (),
+        horizon_days: int = DEFAULT_HORIZON_DAYS
+    ):
+        self.start_date = start_date
+        self._weekday_mask = np.zeros(7, dtype=bool)
+        for weekday in working_weekdays:
+            self._weekday_mask[int(weekday) % 7] = True
+        if not self._weekday_mask.any():
+            raise ValueError("Calendar must have at least one working weekday")
+        self._holiday_offsets = np.array(
+            sorted({(h - start_date).days for h in holidays if h >= start_date}),
+            dtype=np.int64
+        )
+        self._grow_lock = threading.Lock()
+        self._build(max(1, horizon_days))
+
+    @classmethod
+    def for_project(cls, project_input: ProjectInput) -> Optional["WorkCalendar"]:
+        """
+        Returns the project's calendar, or None when no start_date is given
+        (abstract integer-day scheduling).
+        """
+        if project_input.start_date is None:
+            return None
+        return cls(
+            project_input.start_date,
+            working_weekdays=project_input.working_weekdays,
+            holidays=project_input.holidays
+        )
+
+    def _build(self, horizon_days: int) -> Tuple[int, np.ndarray, np.ndarray]:
+        days = np.arange(horizon_days)
+        is_working = self._weekday_mask[(self.start_date.weekday() + days) % 7]
+        holidays = self._holiday_offsets[self._holiday_offsets < horizon_days]
+        is_working[holidays] = False
+
+        # Published as one tuple: concurrent readers see the old or the new
+        # tables, never a new horizon with old arrays
+        tables = (horizon_days, np.concatenate(([0], np.cumsum(is_working))), np.flatnonzero(is_working))
+        self._tables = tables
+        return tables
+
+    @property
+    def horizon_days(self) -> int:
+        return self._tables[0]
+
+    def _workdays_table(self, count: int) -> np.ndarray:
+        """
+        Calendar offsets of working days, covering at least `count` of them.
+        """
+        tables = self._tables
+        if len(tables[2]) < count:
+            with self._grow_lock:
+                tables = self._tables
+                while len(tables[2]) < count:
+                    tables = self._build(tables[0] * 2)
+        return tables[2]
+
+    def _cumulative_table(self, days: int) -> np.ndarray:
+        """
+        Cumulative working-day counts covering calendar offsets [0, days].
+        """
+        tables = self._tables
+        if days > tables[0]:
+            with self._grow_lock:
+                tables = self._tables
+                horizon = tables[0]
+                while horizon < days:
+                    horizon *= 2
+                if horizon > tables[0]:
+                    tables = self._build(horizon)
+        return tables[1]
+
+    # ------------------------------------------------------------------
+    # Working-day offset -> calendar
+    # ------------------------------------------------------------------
+    def start_offset(self, workday):
+        """
+        Calendar day offset on which working day `workday` begins.
+        Accepts ints or integer arrays.
+        """
+        workday = np.asarray(workday, dtype=np.int64)
+        return self._workdays_table(int(workday.max(initial=0)) + 1)[workday]
+
+    def finish_offset(self, workday_end):
+        """
+        Elapsed calendar days until work ending at working-day offset
+        `workday_end` (exclusive) is complete. Fractional ends are rounded up.
+        """
+        workday_end = np.ceil(np.asarray(workday_end)).astype(np.int64)
+        workdays = self._workdays_table(int(workday_end.max(initial=0)))
+        last_day = workdays[np.maximum(workday_end - 1, 0)]
+        return np.where(workday_end > 0, last_day + 1, 0)
+
+    def start_date_of(self, workday: int) -> date:
+        return self.start_date + timedelta(days=int(self.start_offset(workday)))
+
+    def end_date_of(self, workday_end) -> date:
+        """
+        Date of the last working day for work ending at `workday_end`.
+        """
+        elapsed = int(self.finish_offset(workday_end))
+        return self.start_date + timedelta(days=max(elapsed - 1, 0))
+
+    def schedule_dates(self, schedule: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, date]]:
+        """
+        Maps a working-day schedule to {'start': first date, 'end': last working date}.
+        """
+        return {
+            task_id: {
+                "start": self.start_date_of(timing["start"]),
+                "end": self.end_date_of(timing["end"])
+            }
+            for task_id, timing in schedule.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Calendar -> working-day offset
+    # ------------------------------------------------------------------
+    def workdays_before(self, calendar_days):
+        """
+        Working days available before calendar day offset `calendar_days`.
+        A deadline of D calendar days allows `workdays_before(D)` working days.
+        """
+        calendar_days = np.asarray(calendar_days, dtype=np.int64)
+        cumulative = self._cumulative_table(int(calendar_days.max(initial=0)))
+        return cumulative[np.clip(calendar_days, 0, None)]
+
+    def to_workday(self, day: date) -> int:
+        return int(self.workdays_before((day - self.start_date).days))
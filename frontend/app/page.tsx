@@ -1,6 +1,6 @@
 "use client";
 
-import { useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import axios from "axios";
 
 export default function Home() {
@@ -17,6 +17,43 @@ export default function Home() {
   const [result, setResult] = useState<any>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
+  const [live, setLive] = useState(false);
+  const sessionRef = useRef<WebSocket | null>(null);
+
+  // Live planning session: the backend keeps the compiled project and pushes
+  // only the result sections that changed; the summary arrives once input settles.
+  useEffect(() => {
+    const ws = new WebSocket("ws://localhost:8000/ws/session");
+    sessionRef.current = ws;
+    ws.onopen = () => {
+      setLive(true);
+      ws.send(JSON.stringify({ type: "init", project: form }));
+    };
+    ws.onclose = () => setLive(false);
+    ws.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === "result") {
+        setError("");
+        setResult((prev: any) => ({ ...(prev || {}), ...message.changed }));
+      } else if (message.type === "summary") {
+        setResult((prev: any) =>
+          prev ? { ...prev, executive_summary: message.executive_summary } : prev,
+        );
+      } else if (message.type === "error") {
+        setError(message.detail);
+      }
+    };
+    return () => ws.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  const updateField = (key: string, value: string) => {
+    setForm({ ...form, [key]: value });
+    const ws = sessionRef.current;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      ws.send(JSON.stringify({ type: "update", changes: { [key]: value } }));
+    }
+  };
 
   const handleSubmit = async () => {
     setLoading(true);
@@ -51,6 +88,11 @@ export default function Home() {
         <div className="bg-white p-6 rounded-xl shadow-lg border border-slate-200">
           <h2 className="text-lg font-semibold mb-4 text-slate-700">
             Project Parameters
+            {live && (
+              <span className="ml-3 px-2 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-700">
+                Live
+              </span>
+            )}
           </h2>
           <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
             {Object.keys(form).map((key) => (
@@ -68,7 +110,7 @@ export default function Home() {
                   }
                   placeholder={key === "provider" ? "gemini or groq" : ""}
                   value={(form as any)[key]}
-                  onChange={(e) => setForm({ ...form, [key]: e.target.value })}
+                  onChange={(e) => updateField(key, e.target.value)}
                   className="border border-slate-300 p-2 rounded focus:ring-2 focus:ring-blue-500 focus:outline-none transition"
                 />
               </div>
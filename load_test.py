@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+import httpx
+import numpy as np
+
+# Payload mixes: name -> (method path, body builder)
+BASE_PROJECT = {
+    "area": 1000,
+    "floors": 2,
+    "deadline": 150,
+    "budget": 500000,
+    "workforce_cap": 50,
+    "provider": "stub",
+    "api_key": "load-test"
+}
+
+def default_payload(rng: random.Random) -> dict:
+    # Vary the deadline so requests are not all coalesced into one
+    return {**BASE_PROJECT, "deadline": rng.randint(100, 200)}
+
+def large_network_payload(rng: random.Random, size: int = 300, width: int = 20) -> dict:
+    """
+    Layered random DAG of `size` tasks; each task depends on 1-3 tasks of
+    the previous layer.
+    """
+    tasks = []
+    for i in range(size):
+        layer = i // width
+        previous = list(range((layer - 1) * width, layer * width)) if layer else []
+        dependencies = [f"T{d}" for d in rng.sample(previous, min(len(previous), rng.randint(1, 3)))]
+        tasks.append({
+            "id": f"T{i}",
+            "name": f"Task {i}",
+            "base_duration_per_sqyard": round(rng.uniform(0.002, 0.02), 4),
+            "required_workers": rng.randint(2, 12),
+            "cost_per_day": rng.randint(300, 2000),
+            "dependencies": dependencies
+        })
+    return {**default_payload(rng), "tasks": tasks}
+
+def batch_payload(rng: random.Random, size: int = 5) -> dict:
+    return {"projects": [default_payload(rng) for _ in range(size)]}
+
+MIXES = {
+    "default": ("/analyze_project", default_payload),
+    "large": ("/analyze_project", large_network_payload),
+    "batch": ("/analyze_batch", batch_payload),
+}
+
+def parse_mix(spec: str) -> dict:
+    """
+    'default=0.6,large=0.3,batch=0.1' -> normalized weights.
+    """
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in MIXES:
+            raise ValueError(f"Unknown payload mix '{name}' (choose from {', '.join(MIXES)})")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+async def worker(client, mix, deadline, rng, latencies, statuses):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        path, build = MIXES[name]
+        body = build(rng)
+        started = time.perf_counter()
+        try:
+            response = await client.post(path, json=body)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latencies[name].append(time.perf_counter() - started)
+        statuses[(name, status)] += 1
+
+def summarize(latencies, statuses, elapsed) -> dict:
+    report = {"elapsed_seconds": round(elapsed, 2), "mixes": {}}
+    all_latencies = []
+    for name, samples in latencies.items():
+        if not samples:
+            continue
+        all_latencies.extend(samples)
+        report["mixes"][name] = describe(samples, elapsed)
+        report["mixes"][name]["status"] = {str(s): n for (mix, s), n in statuses.items() if mix == name}
+    report["total"] = describe(all_latencies, elapsed) if all_latencies else {}
+    return report
+
+def describe(samples, elapsed) -> dict:
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(p50, 1),
+        "p95_ms": round(p95, 1),
+        "p99_ms": round(p99, 1),
+    }
+
+async def run_load_test(url, concurrency, duration, mix, seed):
+    """
+    Drives the API with `concurrency` closed-loop workers for `duration`
+    seconds. Without a URL the app is served in-process (ASGI transport),
+    so no server or network is needed; note the load generator then shares
+    the process (and CPU) with the app.
+    """
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=120)
+    else:
+        from backend.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=120)
+
+    latencies = {name: [] for name in mix}
+    statuses = Counter()
+    async with client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, mix, deadline, random.Random(seed + i), latencies, statuses)
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        metrics = (await client.get("/metrics")).json()
+
+    report = summarize(latencies, statuses, elapsed)
+    report["server_metrics"] = metrics
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the Constructive Builder API")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--mix", default="default=0.6,large=0.3,batch=0.1", help="Weighted payload mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args.url, args.concurrency, args.duration, parse_mix(args.mix), args.seed))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import asyncio
+from unittest.mock import patch
+from backend.config import settings
+from backend.llm_factory import LLMFactory
+from backend.models import ConstructionTask, ProjectInput, BatchAnalysisRequest
+from backend.main import analyze_batch
+
+def test_stub_provider():
+    service = LLMFactory.get_service("stub", "")
+    service.latency_seconds = 0
+    data = {"duration": 120, "feasibility": {"feasible": True, "issues": []}, "risks": {"p80_duration": 130.0}}
+    assert service.generate_summary(data) == service.generate_summary(data)
+    assert "Feasible" in service.generate_summary(data)
+
+def test_analyze_batch():
+    with patch.object(settings, "STUB_LLM_LATENCY_SECONDS", 0):
+        run_batch()
+
+def run_batch():
+    project = ProjectInput(area=1000, floors=2, deadline=150, budget=500000, workforce_cap=50, provider="stub", api_key="test")
+    cyclic = project.copy(update={"tasks": [
+        ConstructionTask(id="A", name="A", base_duration_per_sqyard=0.01, required_workers=1, cost_per_day=100, dependencies=["B"]),
+        ConstructionTask(id="B", name="B", base_duration_per_sqyard=0.01, required_workers=1, cost_per_day=100, dependencies=["A"]),
+    ]})
+    response = asyncio.run(analyze_batch(BatchAnalysisRequest(projects=[project, cyclic, project.copy(update={"deadline": 90})])))
+
+    ok, failed, tight = response.results
+    assert ok.status_code == 200 and ok.result.total_duration > 0
+    assert ok.result.executive_summary.startswith("## Feasibility Verdict")
+    # A failing project reports its own status instead of failing the batch
+    assert failed.status_code == 400 and failed.result is None and failed.error
+    assert tight.status_code == 200 and tight.result.total_duration == ok.result.total_duration
+
+if __name__ == "__main__":
+    test_stub_provider()
+    test_analyze_batch()
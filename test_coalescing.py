@@ -0,0 +1,74 @@
+import asyncio
+import time
+import httpx
+from backend import main
+from backend.coalescing import SingleFlight, request_fingerprint
+from backend.models import ProjectInput
+
+def test_request_fingerprint():
+    a = ProjectInput(area=1000, floors=2, deadline=100, budget=100000, workforce_cap=20, api_key="key-a")
+    b = ProjectInput(area=1000, floors=2, deadline=100, budget=100000, workforce_cap=20, api_key="key-b")
+    c = ProjectInput(area=1001, floors=2, deadline=100, budget=100000, workforce_cap=20, api_key="key-a")
+    assert request_fingerprint(a) == request_fingerprint(b)
+    assert request_fingerprint(a) != request_fingerprint(c)
+
+def test_single_flight():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)), flight.do("other", work))
+        assert all(r == {"value": 42} for r in results)
+        assert len(calls) == 2
+        assert flight.metrics() == {"requests": 6, "executed": 2, "coalesced": 4, "in_flight": 0}
+
+        # Once finished, the same key runs again (no result caching)
+        await flight.do("k", work)
+        assert len(calls) == 3
+
+    asyncio.run(scenario())
+
+def test_analyze_project_coalescing():
+    # Slow the pipeline down so all concurrent clients overlap the first run
+    original = main.run_analysis
+    runs = []
+
+    def slow_run_analysis(project_input):
+        runs.append(project_input.api_key)
+        time.sleep(0.2)
+        return original(project_input)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            before = (await client.get("/metrics")).json()["analyze_project"]
+            payloads = [
+                {"area": 1000, "floors": 2, "deadline": 150, "budget": 5000000, "workforce_cap": 50,
+                 "provider": "none", "api_key": f"key-{i}"}
+                for i in range(8)
+            ]
+            responses = await asyncio.gather(*(client.post("/analyze_project", json=p) for p in payloads))
+            after = (await client.get("/metrics")).json()["analyze_project"]
+        return before, responses, after
+
+    main.run_analysis = slow_run_analysis
+    try:
+        before, responses, after = asyncio.run(scenario())
+    finally:
+        main.run_analysis = original
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.text for r in responses}) == 1
+    assert len(runs) == 1
+    assert after["coalesced"] - before["coalesced"] == 7
+    assert after["in_flight"] == 0
+
+if __name__ == "__main__":
+    test_request_fingerprint()
+    test_single_flight()
+    test_analyze_project_coalescing()
@@ -0,0 +1,83 @@
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput, DurationDistribution
+from backend.network import TaskNetwork
+from backend.distributions import DurationSampler
+
+def make_task(task_id, distribution=None, group=None):
+    return ConstructionTask(
+        id=task_id, name=task_id, base_duration_per_sqyard=0.01, required_workers=1,
+        cost_per_day=100, dependencies=[], duration_distribution=distribution, correlation_group=group
+    )
+
+def test_distribution_shapes():
+    tasks = [
+        make_task("U"),
+        make_task("TRI", DurationDistribution(kind="triangular", low=0.9, mode=1.0, high=1.4)),
+        make_task("PERT", DurationDistribution(kind="pert", low=0.8, mode=1.0, high=1.5)),
+        make_task("LOG", DurationDistribution(kind="lognormal", mode=1.0, sigma=0.2)),
+        make_task("EMP", DurationDistribution(kind="empirical", samples=[1.0, 1.1, 1.2])),
+    ]
+    sampler = DurationSampler(TaskNetwork(tasks))
+    samples = sampler.sample(np.random.default_rng(0), 50000)
+    means = samples.mean(axis=1)
+
+    assert abs(means[0] - 1.0) < 0.01 and samples[0].min() >= 0.85 and samples[0].max() <= 1.15
+    assert abs(means[1] - (0.9 + 1.0 + 1.4) / 3) < 0.01
+    assert abs(means[2] - (0.8 + 4 * 1.0 + 1.5) / 6) < 0.01
+    assert abs(np.median(samples[3]) - 1.0) < 0.01
+    assert 0.99 < samples[4].min() and samples[4].max() < 1.21
+
+def test_correlation_groups():
+    tasks = [make_task("A", group="weather"), make_task("B", group="weather"), make_task("C")]
+    project_input = ProjectInput(
+        area=1000, floors=1, deadline=30, budget=1e6, workforce_cap=20, api_key="test",
+        correlation_groups={"weather": 0.8}
+    )
+    network = TaskNetwork.for_project(tasks, project_input)
+    samples = DurationSampler(network, project_input.correlation_groups).sample(np.random.default_rng(0), 50000)
+    corr = np.corrcoef(samples)
+
+    assert corr[0, 1] > 0.7
+    assert abs(corr[0, 2]) < 0.05
+    # Marginals are preserved by the copula
+    assert abs(samples[0].mean() - 1.0) < 0.01 and samples[0].max() <= 1.15
+
+def test_copula_preserves_exact_marginals():
+    pert = DurationDistribution(kind="pert", low=0.8, mode=1.0, high=1.5)
+    tasks = [
+        make_task("P", pert, group="weather"),
+        make_task("E", DurationDistribution(kind="empirical", samples=[1.0, 1.1, 1.2]), group="weather"),
+        make_task("Q", pert),
+    ]
+    project_input = ProjectInput(
+        area=1000, floors=1, deadline=30, budget=1e6, workforce_cap=20, api_key="test",
+        correlation_groups={"weather": 0.9}
+    )
+    network = TaskNetwork.for_project(tasks, project_input)
+    samples = DurationSampler(network, project_input.correlation_groups).sample(np.random.default_rng(1), 50000)
+
+    # Correlated (inverse CDF) and independent (beta draws) PERT share one marginal
+    for row in (0, 2):
+        assert abs(samples[row].mean() - (0.8 + 4 * 1.0 + 1.5) / 6) < 0.005
+        assert 0.8 <= samples[row].min() and samples[row].max() <= 1.5
+    assert abs(np.median(samples[0]) - np.median(samples[2])) < 0.01
+    assert 1.0 <= samples[1].min() and samples[1].max() <= 1.2
+    assert np.corrcoef(samples)[0, 1] > 0.8
+
+def test_invalid_distribution():
+    for spec in (
+        DurationDistribution(kind="weibull"),
+        DurationDistribution(kind="triangular", low=1.2, mode=1.0, high=1.4),
+        DurationDistribution(kind="empirical", samples=[]),
+    ):
+        try:
+            DurationSampler(TaskNetwork([make_task("A", spec)]))
+            assert False, f"{spec.kind} should be rejected"
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    test_distribution_shapes()
+    test_correlation_groups()
+    test_copula_preserves_exact_marginals()
+    test_invalid_distribution()
@@ -0,0 +1,133 @@
+import time
+import threading
+from backend.jobs import JobManager, COMPLETED, CANCELLED, FAILED
+
+def wait_for(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.status not in (COMPLETED, CANCELLED, FAILED) and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+def test_job_manager():
+    manager = JobManager(max_workers=1, max_pending=10, retention_seconds=3600)
+
+    # 1. Completion with progress reporting
+    def work(job):
+        for done in range(1, 5):
+            job.report_progress(done, 4)
+        return "done"
+
+    job = manager.submit("simulation", work)
+    assert wait_for(job) == COMPLETED
+    assert manager.get(job.id).result == "done"
+    assert job.progress == 1.0
+
+    # 2. Cancellation: a running job stops at its next progress report,
+    #    and a job queued behind it (single worker) never starts.
+    started = threading.Event()
+
+    def slow_work(job):
+        started.set()
+        while True:
+            job.report_progress(0, 1)
+            time.sleep(0.01)
+
+    running = manager.submit("simulation", slow_work)
+    queued = manager.submit("simulation", work)
+    started.wait(2)
+    manager.cancel(queued.id)
+    manager.cancel(running.id)
+    assert wait_for(running) == CANCELLED
+    assert wait_for(queued) == CANCELLED
+    assert queued.result is None
+
+    # 3. Work that finishes after a cancel request (no later progress report) is still cancelled
+    started.clear()
+    finish = threading.Event()
+
+    def quiet_work(job):
+        started.set()
+        finish.wait(2)
+        return "late"
+
+    quiet = manager.submit("analysis", quiet_work)
+    started.wait(2)
+    manager.cancel(quiet.id)
+    finish.set()
+    assert wait_for(quiet) == CANCELLED and quiet.result is None
+
+    # 4. Failures are captured on the job
+    failed = manager.submit("analysis", lambda job: 1 / 0)
+    assert wait_for(failed) == FAILED
+    assert "division" in failed.error
+
+    # 5. Expired results are purged
+    manager.retention = manager.retention * 0
+    time.sleep(0.01)
+    assert manager.get(job.id) is None
+    manager.shutdown()
+
+def test_cancel_during_submit():
+    # A cancel racing with submit() must never see a job without its future
+    manager = JobManager(max_workers=1)
+    submit, errors = manager._executor.submit, []
+
+    def cancel_all():
+        try:
+            for job_id in list(manager._jobs):
+                manager.cancel(job_id)
+        except Exception as e:
+            errors.append(e)
+
+    def racing_submit(*args):
+        canceller = threading.Thread(target=cancel_all)
+        canceller.start()
+        canceller.join(0.05)
+        return submit(*args)
+
+    manager._executor.submit = racing_submit
+    for _ in range(3):
+        manager.submit("simulation", lambda job: time.sleep(0.01))
+    manager._executor.submit = submit
+    time.sleep(0.1)
+    assert errors == []
+    manager.shutdown()
+
+def test_job_endpoints():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    project = {"area": 1000, "floors": 2, "deadline": 150, "budget": 5000000, "workforce_cap": 50, "api_key": "test"}
+
+    response = client.post("/jobs", json={"kind": "simulation", "project": project, "num_simulations": 25000, "seed": 1})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(500):
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] == COMPLETED:
+            break
+        time.sleep(0.01)
+    assert status["status"] == COMPLETED
+    assert client.get(f"/jobs/{job_id}/result").json()["p50_duration"] > 0
+
+    sweep = client.post("/jobs", json={
+        "kind": "sweep", "project": project, "num_simulations": 100,
+        "sweep_parameter": "deadline", "sweep_values": [100, 500]
+    }).json()
+    for _ in range(500):
+        if client.get(f"/jobs/{sweep['job_id']}").json()["status"] == COMPLETED:
+            break
+        time.sleep(0.01)
+    results = client.get(f"/jobs/{sweep['job_id']}/result").json()["results"]
+    assert results[0]["simulation_results"]["deadline_risk_probability"] == 100.0
+    assert results[1]["simulation_results"]["deadline_risk_probability"] == 0.0
+
+    assert client.post("/jobs", json={"kind": "sweep", "project": project, "sweep_parameter": "api_key"}).status_code == 400
+    assert client.get("/jobs/unknown").status_code == 404
+
+if __name__ == "__main__":
+    test_job_manager()
+    test_cancel_during_submit()
+    test_job_endpoints()
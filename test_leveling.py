@@ -0,0 +1,52 @@
+from backend.models import ConstructionTask, ProjectInput
+from backend.scheduler import Scheduler
+from backend.critical_path import CriticalPathAnalyzer
+from backend.leveling import ResourceLeveler
+
+def make_task(task_id, days, workers, deps=()):
+    return ConstructionTask(
+        id=task_id, name=task_id, base_duration_per_sqyard=days / 1000, required_workers=workers,
+        cost_per_day=100, dependencies=list(deps), repeat_per_floor=True
+    )
+
+def level(tasks, project_input):
+    scheduler = Scheduler(tasks)
+    schedule = scheduler.calculate_schedule(project_input)
+    analytics = CriticalPathAnalyzer(schedule, tasks, network=scheduler.network).identify_critical_path()["task_analytics"]
+    return schedule, scheduler.network, ResourceLeveler().level(schedule, scheduler.network, analytics)
+
+def test_leveling_flattens_profile():
+    # A is critical (10 days); B and C both start on day 0 and stack on top of it
+    tasks = [make_task("A", 10, 5), make_task("B", 2, 5), make_task("C", 2, 5), make_task("D", 2, 5, ["C"])]
+    project_input = ProjectInput(area=1000, floors=1, deadline=30, budget=1e6, workforce_cap=10, api_key="test")
+    schedule, _, result = level(tasks, project_input)
+
+    assert result.peak_before == 15 and result.peak_after == 10
+    assert result.variance_after < result.variance_before
+    assert result.total_duration == 10 and len(result.profile_after) == 10
+    assert sum(result.profile_after) == sum(result.profile_before)
+    assert result.leveled_schedule["A"] == schedule["A"] # Critical task pinned
+    assert result.leveled_schedule["C"]["end"] <= result.leveled_schedule["D"]["start"]
+
+def test_leveling_line_of_balance():
+    tasks = [
+        make_task("FRAME", 5, 10), make_task("MEP", 3, 8, ["FRAME"]),
+        make_task("FINISH", 4, 6, ["FRAME"]), make_task("PAINT", 1, 4, ["MEP", "FINISH"]),
+    ]
+    project_input = ProjectInput(
+        area=1000, floors=20, deadline=300, budget=1e7, workforce_cap=20, api_key="test", scheduling_mode="line_of_balance"
+    )
+    schedule, network, result = level(tasks, project_input)
+
+    assert result.total_duration == max(t["end"] for t in schedule.values())
+    assert result.peak_after <= result.peak_before and result.variance_after <= result.variance_before
+    leveled = result.leveled_schedule
+    ids = network.instance_ids
+    _, preds, _ = network.dependencies()
+    for slot, slot_preds in enumerate(preds):
+        for pred in slot_preds:
+            assert leveled[ids[pred]]["end"] <= leveled[ids[slot]]["start"]
+
+if __name__ == "__main__":
+    test_leveling_flattens_profile()
+    test_leveling_line_of_balance()
@@ -0,0 +1,63 @@
+from backend.models import ConstructionTask, ProjectInput
+from backend.scheduler import Scheduler
+from backend.critical_path import CriticalPathAnalyzer
+from backend.cost_engine import CostEngine
+from backend.simulation import RiskSimulator
+
+def test_line_of_balance():
+    # Foundation (single) -> Walls -> Slab (per floor) -> Handover (single)
+    # Walls on floor f+1 wait for the Slab on floor f.
+    tasks = [
+        ConstructionTask(id="F", name="Foundation", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=100, dependencies=[]),
+        ConstructionTask(id="W", name="Walls", base_duration_per_sqyard=0.02, required_workers=5, cost_per_day=200, dependencies=["F"], repeat_per_floor=True, floor_dependencies=["S"]),
+        ConstructionTask(id="S", name="Slab", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=300, dependencies=["W"], repeat_per_floor=True),
+        ConstructionTask(id="H", name="Handover", base_duration_per_sqyard=0.005, required_workers=2, cost_per_day=50, dependencies=["S"]),
+    ]
+
+    # 1000 sq yards per floor: F=10, W=20, S=10, H=5
+    project_input = ProjectInput(
+        area=1000, floors=3, deadline=100, budget=1000000, workforce_cap=20,
+        api_key="test", scheduling_mode="line_of_balance"
+    )
+
+    scheduler = Scheduler(tasks)
+    schedule = scheduler.calculate_schedule(project_input)
+
+    # Expected Schedule:
+    # F: 0-10 | W@F1: 10-30, S@F1: 30-40 | W@F2: 40-60, S@F2: 60-70 | W@F3: 70-90, S@F3: 90-100 | H: 100-105
+    assert schedule["F"] == {"start": 0, "end": 10}
+    assert schedule["W@F1"] == {"start": 10, "end": 30}
+    assert schedule["S@F1"] == {"start": 30, "end": 40}
+    assert schedule["W@F2"] == {"start": 40, "end": 60}
+    assert schedule["S@F3"] == {"start": 90, "end": 100}
+    assert schedule["H"] == {"start": 100, "end": 105}
+    assert scheduler.get_total_duration(schedule) == 105
+
+    # Standard mode ignores floors for durations
+    standard = Scheduler(tasks).calculate_schedule(project_input.copy(update={"scheduling_mode": "standard"}))
+    assert set(standard) == {"F", "W", "S", "H"}
+    assert standard["H"]["end"] == 45
+
+    # Critical Path: the chain is fully serial, so everything is critical
+    cp = CriticalPathAnalyzer(schedule, tasks, network=scheduler.network).identify_critical_path()
+    assert cp["critical_path"][0] == "F"
+    assert cp["critical_path"][-1] == "H"
+    assert all(a["slack"] == 0 for a in cp["task_analytics"].values())
+
+    # Cost: labor = 10*100 + 3*(20*200 + 10*300) + 5*50 = 22250
+    estimate = CostEngine().calculate_total_cost(schedule, scheduler.network.task_map(), project_input)
+    assert estimate.labor_cost == 22250
+
+    # Simulation runs on the same compiled network
+    result = RiskSimulator().run_simulation(tasks, project_input, network=scheduler.network, seed=7)
+    assert 0.85 * 105 <= result.p50_duration <= 1.15 * 105
+
+    # Unknown modes are rejected (422) instead of silently scheduling as 'standard'
+    try:
+        ProjectInput(area=1000, floors=3, deadline=100, budget=1000000, workforce_cap=20, api_key="test", scheduling_mode="lob")
+        assert False, "expected a validation error"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_line_of_balance()
@@ -0,0 +1,84 @@
+import time
+from backend.llm_orchestrator import LLMOrchestrator, CircuitBreaker, OPEN, HALF_OPEN, CLOSED
+from backend.prompt_builder import prompt_stats
+
+class FakeService:
+    def __init__(self, name, behaviours):
+        self.name = name
+        self.behaviours = behaviours
+
+    def generate_summary(self, project_data, context):
+        delay, fails = self.behaviours[self.name]
+        assert context.startswith("inputs: ")
+        time.sleep(delay)
+        if fails:
+            raise RuntimeError(f"{self.name} unavailable")
+        return f"summary from {self.name}"
+
+def make_orchestrator(behaviours, **kwargs):
+    options = dict(budget_seconds=1.0, hedge_delay_seconds=0.2, failure_threshold=2, reset_seconds=60)
+    options.update(kwargs)
+    return LLMOrchestrator(
+        provider_order=["primary", "secondary"],
+        api_keys={"secondary": "key"},
+        service_factory=lambda name, key: FakeService(name, behaviours),
+        known_providers=["primary", "secondary"],
+        **options
+    )
+
+PROJECT_DATA = {"duration": 100, "feasibility": {"feasible": True, "issues": []}, "risks": {"p80_duration": 110.0}, "critical_path": ["T1"]}
+
+def test_failover_and_circuit_breaker():
+    orchestrator = make_orchestrator({"primary": (0, True), "secondary": (0, False)})
+    for _ in range(2):
+        assert orchestrator.generate_summary(PROJECT_DATA, "primary", "key") == "summary from secondary"
+
+    # Two consecutive failures open the primary's circuit: it is now skipped without a call
+    assert orchestrator.generate_summary(PROJECT_DATA, "primary", "key") == "summary from secondary"
+    metrics = orchestrator.metrics()["providers"]
+    assert metrics["primary"]["state"] == OPEN
+    assert metrics["primary"]["attempts"] == 2 and metrics["primary"]["skipped"] == 1
+    assert metrics["secondary"]["wins"] == 3
+
+def test_hedged_request():
+    orchestrator = make_orchestrator({"primary": (0.6, False), "secondary": (0, False)})
+    built_before = prompt_stats.built
+    started = time.monotonic()
+    assert orchestrator.generate_summary(PROJECT_DATA, "primary", "key") == "summary from secondary"
+    assert time.monotonic() - started < 0.5
+    assert prompt_stats.built == built_before + 1 # One context shared by both attempts
+    assert orchestrator.metrics()["providers"]["secondary"]["hedged"] == 1
+
+def test_latency_budget_falls_back_to_offline_report():
+    orchestrator = make_orchestrator({"primary": (2, False), "secondary": (2, False)}, budget_seconds=0.3, hedge_delay_seconds=0.1)
+    started = time.monotonic()
+    summary = orchestrator.generate_summary(PROJECT_DATA, "primary", "key")
+    assert time.monotonic() - started < 0.6
+    assert summary.startswith("## 1. Feasibility Verdict")
+    metrics = orchestrator.metrics()
+    assert metrics["fallbacks"] == 1 and metrics["providers"]["primary"]["timeouts"] == 1
+
+def test_unknown_providers_are_rejected():
+    orchestrator = make_orchestrator({"primary": (0, False), "secondary": (0, False)})
+    for i in range(5):
+        assert orchestrator.generate_summary(PROJECT_DATA, f"made-up-{i}", "key") == "summary from secondary"
+    metrics = orchestrator.metrics()
+    assert set(metrics["providers"]) == {"secondary"} and metrics["rejected_providers"] == 5
+
+def test_circuit_breaker_half_open():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    now[0] = 11
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow() # Only one trial call while half-open
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+if __name__ == "__main__":
+    test_failover_and_circuit_breaker()
+    test_hedged_request()
+    test_latency_budget_falls_back_to_offline_report()
+    test_unknown_providers_are_rejected()
+    test_circuit_breaker_half_open()
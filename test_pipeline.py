@@ -0,0 +1,107 @@
+import threading
+from unittest.mock import patch
+from backend.config import settings
+from backend.models import ProjectInput
+from backend.pipeline import AnalysisPipeline, Stage
+from backend.main import analysis_pipeline, run_analysis
+
+def test_pipeline_plans_and_runs_concurrently():
+    calls = []
+    barrier = threading.Barrier(2, timeout=5) # Deadlocks (then times out) unless B and C overlap
+
+    def stage(name, outputs, wait=False):
+        def run(**inputs):
+            calls.append(name)
+            if wait:
+                barrier.wait()
+            return {output: sum((v for v in inputs.values() if v is not None), 1) for output in outputs}
+        return run
+
+    pipeline = AnalysisPipeline([
+        Stage("a", ["x"], ["a"], stage("a", ["a"])),
+        Stage("b", ["a"], ["b"], stage("b", ["b"], wait=True)),
+        Stage("c", ["a"], ["c"], stage("c", ["c"], wait=True)),
+        Stage("d", ["b"], ["d"], stage("d", ["d"]), optional_inputs=["c"]),
+        Stage("unused", ["x"], ["u"], stage("unused", ["u"])),
+    ])
+    artifacts = pipeline.run({"x": 0}, ["d", "c"])
+    assert artifacts["a"] == 1 and artifacts["b"] == artifacts["c"] == 2
+    assert artifacts["d"] == 5 # Waited for the optional input c
+    assert "unused" not in calls and calls.count("a") == 1
+
+    # Optional inputs never pull their producer in
+    calls.clear()
+    barrier.reset()
+    pipeline = AnalysisPipeline([
+        Stage("a", ["x"], ["a"], stage("a", ["a"])),
+        Stage("c", ["a"], ["c"], stage("c", ["c"])),
+        Stage("d", ["a"], ["d"], stage("d", ["d"]), optional_inputs=["c"]),
+    ])
+    assert pipeline.run({"x": 0}, ["d"])["d"] == 2 and "c" not in calls
+    pipeline.shutdown()
+
+def test_pipeline_progresses_with_saturated_pool():
+    # Every worker is busy with another request: queued stages are reclaimed and run by the caller
+    pipeline = AnalysisPipeline([
+        Stage("a", ["x"], ["a"], lambda x: {"a": x + 1}),
+        Stage("b", ["x"], ["b"], lambda x: {"b": x + 2}),
+        Stage("c", ["x"], ["c"], lambda x: {"c": x + 3}),
+        Stage("sum", ["a", "b", "c"], ["sum"], lambda a, b, c: {"sum": a + b + c}),
+    ], max_workers=1)
+    release = threading.Event()
+    blocker = pipeline._executor.submit(release.wait, 5)
+    try:
+        assert pipeline.run({"x": 0}, ["sum"])["sum"] == 6
+        assert not blocker.done()
+    finally:
+        release.set()
+        pipeline.shutdown()
+
+def test_pipeline_progress_and_abort():
+    ran = []
+    pipeline = AnalysisPipeline([
+        Stage(name, [source], [name], lambda name=name, **inputs: ran.append(name) or {name: 1})
+        for name, source in (("a", "x"), ("b", "a"), ("c", "b"))
+    ])
+    progress = []
+    pipeline.run({"x": 0}, ["c"], progress_callback=lambda done, total: progress.append((done, total)))
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    # Raising from the callback (e.g. a cancelled job) stops before the next stage
+    ran.clear()
+
+    def cancel(done, total):
+        raise RuntimeError("cancelled")
+    try:
+        pipeline.run({"x": 0}, ["c"], progress_callback=cancel)
+        assert False, "expected the callback's exception"
+    except RuntimeError:
+        pass
+    assert ran == ["a"]
+    pipeline.shutdown()
+
+def test_analysis_skip_stages():
+    with patch.object(settings, "STUB_LLM_LATENCY_SECONDS", 0):
+        run_skip_stages()
+
+def run_skip_stages():
+    project = ProjectInput(area=1000, floors=2, deadline=150, budget=500000, workforce_cap=50, provider="stub", api_key="test")
+    full = run_analysis(project)
+    assert full.simulation_results is not None and full.critical_path_tasks and full.executive_summary
+
+    lean = run_analysis(project.copy(update={"skip_stages": ["simulation", "summary", "leveling", "critical_path"]}))
+    assert lean.simulation_results is None and lean.executive_summary == "" and lean.critical_path_tasks == []
+    assert lean.deterministic_schedule == full.deterministic_schedule
+    assert lean.total_cost == full.total_cost
+    assert lean.feasibility_status == full.feasibility_status
+
+    # The summary still runs without the simulation
+    no_sim = run_analysis(project.copy(update={"skip_stages": ["simulation"]}))
+    assert no_sim.simulation_results is None and no_sim.executive_summary.startswith("## Feasibility Verdict")
+    assert analysis_pipeline.metrics()["schedule"]["runs"] >= 3
+
+if __name__ == "__main__":
+    test_pipeline_plans_and_runs_concurrently()
+    test_pipeline_progresses_with_saturated_pool()
+    test_pipeline_progress_and_abort()
+    test_analysis_skip_stages()
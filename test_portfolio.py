@@ -0,0 +1,77 @@
+import random
+from backend.models import ConstructionTask, ProjectInput, PortfolioProject, PortfolioRequest
+from backend.portfolio import PortfolioScheduler
+from backend.capacity_profile import CapacityProfile
+
+def make_task(task_id, days, workers, deps=()):
+    return ConstructionTask(
+        id=task_id, name=task_id, base_duration_per_sqyard=days / 1000, required_workers=workers,
+        cost_per_day=100, dependencies=list(deps)
+    )
+
+def make_project(project_id, tasks, deadline, priority=1.0, release_day=0):
+    project = ProjectInput(area=1000, floors=1, deadline=deadline, budget=1e6, workforce_cap=100, api_key="test", tasks=tasks)
+    return PortfolioProject(project_id=project_id, project=project, priority=priority, release_day=release_day)
+
+def test_priority_decides_who_waits():
+    # Both projects need the whole crew for 5 days; only one can meet its deadline
+    request = PortfolioRequest(
+        projects=[
+            make_project("B", [make_task("X", 5, 10)], deadline=5, priority=1),
+            make_project("A", [make_task("X", 5, 10)], deadline=5, priority=3),
+        ],
+        workforce_capacity=10
+    )
+    result = PortfolioScheduler(lambda p: p.tasks).schedule(request)
+    by_id = {p.project_id: p for p in result.projects}
+
+    assert by_id["A"].finish_day == 5 and by_id["A"].lateness == 0
+    assert by_id["B"].schedule["X"] == {"start": 5, "end": 10} and by_id["B"].weighted_lateness == 5
+    assert result.total_weighted_lateness == 5 and result.peak_workforce == 10
+    assert result.workforce_profile == [10] * 10
+
+def test_schedules_respect_precedence_and_capacity():
+    rng = random.Random(3)
+    projects = []
+    for p in range(4):
+        tasks = [
+            make_task(f"T{i}", rng.randint(1, 6), rng.randint(1, 8), [f"T{d}" for d in rng.sample(range(i), min(i, 2))])
+            for i in range(40)
+        ]
+        projects.append(make_project(f"P{p}", tasks, deadline=60, priority=p + 1, release_day=p * 3))
+    request = PortfolioRequest(projects=projects, workforce_capacity=15)
+    result = PortfolioScheduler(lambda p: p.tasks).schedule(request)
+
+    assert max(result.workforce_profile) <= 15
+    for item, scheduled in zip(projects, result.projects):
+        schedule = scheduled.schedule
+        assert min(t["start"] for t in schedule.values()) >= item.release_day
+        for task in item.project.tasks:
+            for dep in task.dependencies:
+                assert schedule[dep]["end"] <= schedule[task.id]["start"]
+    # The profile is exactly the sum of the placed tasks
+    usage = [0] * result.makespan
+    for item, scheduled in zip(projects, result.projects):
+        workers = {t.id: t.required_workers for t in item.project.tasks}
+        for task_id, timing in scheduled.schedule.items():
+            for day in range(timing["start"], timing["end"]):
+                usage[day] += workers[task_id]
+    assert usage == result.workforce_profile
+
+def test_capacity_profile_earliest_fit():
+    profile = CapacityProfile(10, horizon=4)
+    profile.reserve(2, 4, 6)
+    assert profile.earliest_fit(0, 3, 5) == 4 # Days 2-3 only have 4 free
+    assert profile.earliest_fit(0, 2, 4) == 0
+    profile.reserve(4, 20, 10) # Grows the horizon
+    assert profile.earliest_fit(0, 3, 5) == 20
+    try:
+        profile.earliest_fit(0, 1, 11)
+        assert False, "tasks larger than the shared capacity can never be placed"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_priority_decides_who_waits()
+    test_schedules_respect_precedence_and_capacity()
+    test_capacity_profile_earliest_fit()
@@ -0,0 +1,57 @@
+from backend.prompt_builder import build_prompt_context, estimate_raw_chars, estimate_tokens, prompt_stats, strip_secrets
+
+def make_project_data(floors=1, tasks=0, issues=3):
+    return {
+        "input_parameters": {
+            "area": 1000, "floors": floors, "deadline": 100, "budget": 500000, "workforce_cap": 20,
+            "api_key": "sk-very-secret", "provider": "groq",
+            "tasks": [{"id": f"T{i}", "name": f"Task {i}", "dependencies": [f"T{i - 1}"]} for i in range(tasks)],
+        },
+        "duration": 120,
+        "cost_breakdown": {"labor_cost": 10000.0, "material_cost": 500000.0, "total_cost": 561000.0},
+        "feasibility": {
+            "feasible": False,
+            "issues": [f"Deadline exceeded by {i} days." for i in range(issues)],
+            "suggestions": ["Extend deadline.", "Add workers."]
+        },
+        "risks": {"p50_duration": 121.5, "p80_duration": 130.2, "deadline_risk_probability": 88.0,
+                  "duration_quantiles": {"p10": 115.0, "p50": 121.5, "p90": 135.0}},
+        "critical_path": ["T1"] + [f"T5@F{f}" for f in range(1, floors + 1)] + ["T15"],
+    }
+
+def test_compact_prompt():
+    data = make_project_data(floors=60)
+    context = build_prompt_context(data)
+
+    assert "sk-very-secret" not in context and "api_key" not in context
+    assert context == build_prompt_context(data) # Deterministic
+    assert "critical_path (62 tasks): T1; T5 x60; T15" in context
+    assert "p90=135" in context and "p10=115" in context
+    assert "verdict: infeasible" in context
+
+def test_token_cap_and_reduction():
+    # Large custom network: the raw repr grows with the task count, the prompt does not
+    data = make_project_data(floors=60, tasks=2000, issues=200)
+    built_before = prompt_stats.built
+    context = build_prompt_context(data, max_tokens=120)
+
+    assert estimate_tokens(context) <= 120
+    assert context.endswith("[context truncated]")
+    assert "custom_tasks=2000" in context
+    assert estimate_tokens(context) < estimate_tokens(str(data)) / 100
+    # The raw size stat is estimated from a sample, within 25% of the real repr
+    assert abs(estimate_raw_chars(data) - len(str(data))) < 0.25 * len(str(data))
+    assert prompt_stats.built == built_before + 1 and prompt_stats.as_dict()["reduction"] > 0.9
+
+def test_strip_secrets_keeps_token_counts():
+    data = {
+        "api_key": "sk-1", "apiKey": "sk-2", "client_secret": "s", "Password": "p",
+        "nested": [{"access_token": "t", "auth_token": "t", "prompt_tokens": 120}],
+        "max_tokens": 400, "secretary": "kept",
+    }
+    assert strip_secrets(data) == {"nested": [{"prompt_tokens": 120}], "max_tokens": 400, "secretary": "kept"}
+
+if __name__ == "__main__":
+    test_compact_prompt()
+    test_token_cap_and_reduction()
+    test_strip_secrets_keeps_token_counts()
@@ -0,0 +1,44 @@
+import io
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput
+from backend.network import TaskNetwork
+from backend.simulation import RiskSimulator
+from backend.sample_export import export_columns, stream_csv, stream_npy
+
+TASKS = [
+    ConstructionTask(id="T1", name="Task 1", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=100, dependencies=[]),
+    ConstructionTask(id="T2", name="Task 2", base_duration_per_sqyard=0.02, required_workers=5, cost_per_day=200, dependencies=["T1"]),
+]
+PROJECT = ProjectInput(area=1000, floors=1, deadline=30, budget=555500, workforce_cap=20, api_key="test")
+
+def batches(num_runs, batch_size):
+    network = TaskNetwork.for_project(TASKS, PROJECT)
+    return network, RiskSimulator().iter_batches(network, PROJECT, num_runs, seed=11, batch_size=batch_size)
+
+def test_npy_export_round_trip():
+    network, samples = batches(2500, batch_size=None) # Simulator's own block size
+    columns = export_columns(network.instance_ids, include_tasks=True)
+    data = np.load(io.BytesIO(b"".join(stream_npy(samples, 2500, columns, include_tasks=True))))
+
+    assert columns == ["run", "duration", "cost", "T1", "T2"]
+    assert data.shape == (2500, 5)
+    assert np.array_equal(data[:, 0], np.arange(2500))
+    # Chain network: the project duration is the sum of the task draws
+    assert np.allclose(data[:, 1], data[:, 3] + data[:, 4])
+    # Same seed and block size as the simulator: identical samples
+    result = RiskSimulator().run_simulation(TASKS, PROJECT, num_simulations=2500, seed=11)
+    assert float(round(np.percentile(data[:, 1], 80), 1)) == result.p80_duration
+    assert float(round(np.percentile(data[:, 2], 50), 2)) == result.p50_cost
+
+def test_csv_export():
+    network, samples = batches(30, batch_size=7) # Last block is partial
+    columns = export_columns(network.instance_ids, include_tasks=False)
+    lines = b"".join(stream_csv(samples, columns, include_tasks=False)).decode().splitlines()
+
+    assert lines[0] == "run,duration,cost"
+    assert len(lines) == 31 and lines[-1].startswith("29,")
+    assert all(25 < float(line.split(",")[1]) < 35 for line in lines[1:])
+
+if __name__ == "__main__":
+    test_npy_export_round_trip()
+    test_csv_export()
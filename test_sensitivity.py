@@ -0,0 +1,47 @@
+import numpy as np
+from unittest.mock import patch
+from backend import sensitivity
+from backend.models import ConstructionTask, DurationDistribution, ProjectInput, SensitivityRequest
+from backend.sensitivity import SobolAnalyzer, sobol_indices
+
+def test_sobol_indices_additive_model():
+    # f = 2 x1 + x2 with x ~ U(0, 1): S1 = 0.8, S2 = 0.2, no interactions
+    rng = np.random.default_rng(0)
+    a, b = rng.random((2, 20000)), rng.random((2, 20000))
+    f = lambda x: 2 * x[0] + x[1]
+    ab = [np.where(np.arange(2)[:, None] == i, b, a) for i in range(2)]
+    first, total = sobol_indices(f(a), f(b), np.array([f(x) for x in ab]))
+    assert np.allclose(first, [0.8, 0.2], atol=0.03) and np.allclose(total, [0.8, 0.2], atol=0.03)
+
+def test_sobol_analyzer():
+    fixed = DurationDistribution(low=1.0, mode=1.0, high=1.0) # No duration variation
+    tasks = [
+        ConstructionTask(id="A", name="A", base_duration_per_sqyard=0.05, required_workers=1, cost_per_day=100),
+        ConstructionTask(id="B", name="B", base_duration_per_sqyard=0.01, required_workers=1, cost_per_day=100,
+                         dependencies=["A"], duration_distribution=fixed),
+    ]
+    project = ProjectInput(area=1000, floors=1, deadline=100, budget=1e6, workforce_cap=10, api_key="test", tasks=tasks)
+    request = SensitivityRequest(project=project, num_samples=2048, seed=3)
+    result = SobolAnalyzer(lambda p: p.tasks).analyze(request)
+
+    indices = {i.factor: i for i in result.indices}
+    assert set(indices) == {"area", "A.rate", "B.rate", "A.variation", "B.variation"}
+    assert result.num_evaluations == 2048 * 7
+    assert result.indices[0].factor in ("area", "A.rate") # Long task dominates
+    assert indices["B.variation"].duration_total == 0 and indices["B.variation"].duration_first_order == 0
+    assert 0.9 < sum(i.duration_first_order for i in result.indices) < 1.1
+    assert all(i.duration_total >= -0.01 for i in result.indices)
+    assert SobolAnalyzer(lambda p: p.tasks).analyze(request) == result # Seeded design
+    # Passes smaller than one block (split across block boundaries) give the same result
+    with patch.object(sensitivity, "EVALUATION_CELLS", 2 * 300):
+        assert SobolAnalyzer(lambda p: p.tasks).analyze(request) == result
+
+    try:
+        SobolAnalyzer(lambda p: p.tasks, max_evaluations=1000).analyze(request)
+        assert False, "Oversized designs must be rejected"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_sobol_indices_additive_model()
+    test_sobol_analyzer()
@@ -0,0 +1,135 @@
+import asyncio
+from unittest.mock import patch
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from backend import main
+from backend.config import settings
+from backend.session import PlanningSession, serve_session
+
+PROJECT = {"area": 1000, "floors": 2, "deadline": 200, "budget": 5000000, "workforce_cap": 50, "provider": "none", "api_key": "test"}
+
+def test_planning_session_incremental():
+    session = PlanningSession(main.get_project_tasks)
+
+    first = session.apply(PROJECT)
+    assert first["total_duration"] == 145
+    assert first["feasibility_status"] == "Feasible"
+    schedule_before = session.schedule
+
+    # Workforce cap only touches constraints: schedule/simulation are not recomputed
+    changed = session.apply({"workforce_cap": 10})
+    assert session.schedule is schedule_before
+    assert set(changed) <= {"feasibility_status", "constraint_issues", "optimization_suggestions"}
+    assert changed["feasibility_status"] == "Infeasible"
+
+    # Budget feeds the simulation (overrun odds) but not the schedule
+    changed = session.apply({"budget": 1000})
+    assert "simulation_results" in changed
+    assert "deterministic_schedule" not in changed
+
+    # Area changes durations: everything downstream is refreshed; snapshots keep their state
+    snapshot = session.snapshot()
+    changed = session.apply({"area": 2000})
+    assert changed["total_duration"] > 145
+    assert snapshot.total_duration == 145 and snapshot.version == session.version - 1
+
+    # Invalid deltas are rejected and the previous state kept
+    try:
+        session.apply({"area": "not a number"})
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert session.project_input.area == 2000
+
+def test_planning_session_websocket():
+    with patch.object(settings, "SESSION_DEBOUNCE_SECONDS", 0.2), \
+         patch.object(settings, "SESSION_SUMMARY_SETTLE_SECONDS", 0.05):
+        run_websocket_session()
+
+def run_websocket_session():
+    client = TestClient(main.app)
+    with client.websocket_connect("/ws/session") as ws:
+        ws.send_json({"type": "init", "project": PROJECT})
+        result = ws.receive_json()
+        assert result["type"] == "result"
+        assert result["changed"]["total_duration"] == 145
+        summary = ws.receive_json()
+        assert summary["type"] == "summary"
+        assert summary["version"] == result["version"]
+
+        # A burst of slider moves is debounced into one recompute
+        for cap in (40, 30, 20, 10):
+            ws.send_json({"type": "update", "changes": {"workforce_cap": cap}})
+        result = ws.receive_json()
+        assert result["type"] == "result"
+        assert result["version"] == summary["version"] + 1
+        assert "deterministic_schedule" not in result["changed"]
+        assert any("Workforce cap (10)" in issue for issue in result["changed"]["constraint_issues"])
+        assert ws.receive_json()["type"] == "summary"
+
+        ws.send_json({"type": "update", "changes": {"area": "abc"}})
+        assert ws.receive_json()["type"] == "error"
+
+        # A binary frame gets an error reply and the session keeps serving
+        ws.send_bytes(b"\x00\x01")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"type": "update", "changes": {"workforce_cap": 50}})
+        assert ws.receive_json()["type"] == "result"
+
+class ScriptedWebSocket:
+    """
+    Plays (delay, message) pairs; exceptions are raised as receive errors.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.sent = []
+
+    async def receive_json(self):
+        if not self.script:
+            raise WebSocketDisconnect()
+        delay, message = self.script.pop(0)
+        await asyncio.sleep(delay)
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+def serve(script, **timing):
+    ws = ScriptedWebSocket(script)
+    session = PlanningSession(main.get_project_tasks, num_simulations=50)
+    asyncio.run(serve_session(ws, session, lambda s: "summary", settle_seconds=10, **timing))
+    return ws.sent
+
+def test_session_rejects_malformed_messages():
+    sent = serve([
+        (0, {"type": "init", "project": PROJECT}),
+        (0, ValueError("Expecting value")), # Undecodable frame
+        (0, KeyError("text")), # Binary frame
+        (0, TypeError("expected string or bytes-like object")),
+        (0, [1, 2]),
+        (0, {"type": "update", "changes": [1]}),
+        (0, {"type": ["update"]}),
+        (0, {"type": "update", "changes": {"workforce_cap": 10}}),
+    ], debounce_seconds=0.05)
+    errors = [m for m in sent if m["type"] == "error"]
+    results = [m for m in sent if m["type"] == "result"]
+    assert len(errors) == 6 and all("Invalid JSON" in e["detail"] for e in errors[:3])
+    assert "JSON text frame" in errors[1]["detail"]
+    # The connection survived and the valid messages were merged into one recompute
+    assert len(results) == 1 and results[0]["changed"]["feasibility_status"] == "Infeasible"
+
+def test_session_debounce_max_wait():
+    # Messages closer together than the debounce would otherwise never flush
+    script = [(0, {"type": "init", "project": PROJECT})]
+    script += [(0.04, {"type": "update", "changes": {"budget": 5000000 + i}}) for i in range(15)]
+    sent = serve(script, debounce_seconds=0.1, max_wait_seconds=0.15)
+    assert len([m for m in sent if m["type"] == "result"]) >= 3
+
+if __name__ == "__main__":
+    test_planning_session_incremental()
+    test_planning_session_websocket()
+    test_session_rejects_malformed_messages()
+    test_session_debounce_max_wait()
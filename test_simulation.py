@@ -0,0 +1,89 @@
+import json
+import numpy as np
+from backend.models import ConstructionTask, ProjectInput
+from backend.simulation import RiskSimulator
+
+def test_joint_cost_simulation():
+    tasks = [
+        ConstructionTask(id="T1", name="Task 1", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=100, dependencies=[]),
+        ConstructionTask(id="T2", name="Task 2", base_duration_per_sqyard=0.02, required_workers=5, cost_per_day=200, dependencies=["T1"]),
+    ]
+
+    # Deterministic cost (see test_demo_cost): labor 5000 + material 500000 + 10% overhead = 555500
+    # Labor varies with the simulated durations (0.85-1.15), so total cost stays within ~ +/- 825.
+    project_input = ProjectInput(
+        area=1000, floors=1, deadline=30, budget=555500, workforce_cap=20, api_key="test"
+    )
+    result = RiskSimulator().run_simulation(tasks, project_input, num_simulations=2000, seed=42)
+
+    assert abs(result.p50_cost - 555500) < 300
+    assert result.p80_cost >= result.p50_cost
+
+    # Budget sits at the deterministic cost, so roughly half the runs overrun
+    assert 35 < result.budget_overrun_probability < 65
+    # Labor cost and duration move together: late runs are also the expensive ones
+    assert result.joint_overrun_probability > 0.8 * min(result.deadline_risk_probability, result.budget_overrun_probability)
+
+    # Material volatility widens the cost distribution
+    volatile = RiskSimulator().run_simulation(
+        tasks, project_input.copy(update={"material_volatility": 0.1}), num_simulations=2000, seed=42
+    )
+    assert volatile.p80_cost - volatile.p50_cost > result.p80_cost - result.p50_cost
+
+def test_labor_cost_bills_whole_days():
+    # A fixed 1.05 multiplier stretches T1 to 10.5 days and T2 to 21 days; like
+    # CostEngine's integer schedule, labor is billed for 11 + 21 whole days
+    fixed = {"kind": "uniform", "low": 1.05, "mode": 1.05, "high": 1.05}
+    tasks = [
+        ConstructionTask(id="T1", name="Task 1", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=100, dependencies=[], duration_distribution=fixed),
+        ConstructionTask(id="T2", name="Task 2", base_duration_per_sqyard=0.02, required_workers=5, cost_per_day=200, dependencies=["T1"], duration_distribution=fixed),
+    ]
+    project_input = ProjectInput(area=1000, floors=1, deadline=30, budget=555500, workforce_cap=20, api_key="test")
+    result = RiskSimulator().run_simulation(tasks, project_input, num_simulations=50, seed=1)
+
+    labor = 11 * 100 + 21 * 200
+    assert result.p50_cost == result.p80_cost == round((labor + 500000) * 1.1, 2)
+
+def test_duration_distribution_output():
+    tasks = [
+        ConstructionTask(id="T1", name="Task 1", base_duration_per_sqyard=0.01, required_workers=5, cost_per_day=100, dependencies=[]),
+        ConstructionTask(id="T2", name="Task 2", base_duration_per_sqyard=0.02, required_workers=5, cost_per_day=200, dependencies=["T1"]),
+    ]
+    project_input = ProjectInput(
+        area=1000, floors=1, deadline=30, budget=555500, workforce_cap=20, api_key="test",
+        quantiles=[5, 50, 97.5], histogram_bins=20, cdf_points=11
+    )
+    result = RiskSimulator().run_simulation(tasks, project_input, num_simulations=20000, seed=7)
+
+    assert list(result.duration_quantiles) == ["p5", "p50", "p97.5"]
+    assert result.duration_quantiles["p50"] == result.p50_duration
+    assert result.duration_quantiles["p5"] <= result.duration_quantiles["p50"] <= result.duration_quantiles["p97.5"]
+
+    histogram = result.duration_histogram
+    assert len(histogram.bin_edges) == 21 and sum(histogram.counts) == 20000
+
+    cdf = result.duration_cdf
+    assert cdf.probabilities[0] == 0.0 and cdf.probabilities[-1] == 1.0
+    assert all(a <= b for a, b in zip(cdf.durations, cdf.durations[1:]))
+    assert cdf.durations[0] == histogram.bin_edges[0] and cdf.durations[-1] == histogram.bin_edges[-1]
+
+    # Single-sort summaries agree with numpy's percentile and histogram
+    samples = np.random.default_rng(7).normal(100, 10, 5001)
+    summary = RiskSimulator()._duration_distribution(np.sort(samples), project_input.copy(update={"quantiles": [5, 50, 97.5]}))
+    assert summary["duration_histogram"].counts == np.histogram(samples, bins=20)[0].tolist()
+    expected = np.percentile(samples, [5, 50, 97.5]).round(1).tolist()
+    assert list(summary["duration_quantiles"].values()) == expected
+
+    # Payload stays compact regardless of the run count
+    assert len(json.dumps(result.dict(), default=str)) < 4096
+
+    try:
+        RiskSimulator().run_simulation(tasks, project_input.copy(update={"quantiles": [150]}), num_simulations=10)
+        assert False, "out-of-range quantile should be rejected"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_joint_cost_simulation()
+    test_labor_cost_bills_whole_days()
+    test_duration_distribution_output()
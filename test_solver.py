@@ -0,0 +1,41 @@
+import numpy as np
+from backend.models import ProjectInput, SolveRequest
+from backend.main import get_project_tasks, run_analysis
+from backend.solver import GoalSolver, smallest_meeting, share_meeting
+
+def test_smallest_meeting():
+    sample = np.sort(np.arange(1, 101, dtype=float))
+    assert smallest_meeting(sample, 80) == 80 and share_meeting(sample, 80) == 80
+    assert smallest_meeting(sample, 80.5) == 81 and smallest_meeting(sample, 100) == 100
+    assert share_meeting(sample, 0.5) == 0
+
+def test_solve_flips_each_constraint():
+    project = ProjectInput(
+        area=1000, floors=3, deadline=150, budget=500000, workforce_cap=20,
+        provider="stub", api_key="test", scheduling_mode="line_of_balance",
+        skip_stages=["simulation", "summary", "leveling"]
+    )
+    solver = GoalSolver(get_project_tasks)
+    marker = {"workforce_cap": "Workforce cap", "budget": "Budget", "deadline": "Deadline"}
+    step = {"workforce_cap": 1, "budget": 0.01, "deadline": 1}
+
+    for parameter in marker:
+        exact = solver.solve(SolveRequest(project=project, parameter=parameter, target="deterministic"))
+        issues = lambda value: [i for i in run_analysis(project.copy(update={parameter: value})).constraint_issues if marker[parameter] in i]
+        assert not issues(exact.value) and issues(exact.value - step[parameter]) # Minimal
+        assert exact.probability is None and not exact.feasible and len(exact.remaining_issues) == 2
+
+        p80 = solver.solve(SolveRequest(project=project, parameter=parameter, num_simulations=500))
+        assert p80.value >= exact.value and p80.probability >= 80 and p80.current_probability == 0
+        # Common random numbers: the same seed gives the same answer
+        assert solver.solve(SolveRequest(project=project, parameter=parameter, num_simulations=500)) == p80
+
+    try:
+        solver.solve(SolveRequest(project=project, parameter="area"))
+        assert False, "Unknown parameters must be rejected"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_smallest_meeting()
+    test_solve_flips_each_constraint()
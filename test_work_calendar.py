@@ -0,0 +1,67 @@
+from datetime import date
+from backend.models import ConstructionTask, ProjectInput
+from backend.work_calendar import WorkCalendar
+from backend.constraints import ConstraintEngine
+from backend.simulation import RiskSimulator
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+def test_work_calendar():
+    # Monday 2026-01-05, Mon-Fri working, Wednesday 2026-01-07 is a holiday
+    calendar = WorkCalendar(date(2026, 1, 5), holidays=[date(2026, 1, 7)])
+
+    # Working days: Mon 5, Tue 6, Thu 8, Fri 9, Mon 12, ...
+    assert calendar.start_date_of(0) == date(2026, 1, 5)
+    assert calendar.start_date_of(2) == date(2026, 1, 8)
+    assert calendar.start_date_of(4) == date(2026, 1, 12)
+
+    # 4 working days end on Fri 9th -> 5 elapsed calendar days
+    assert calendar.end_date_of(4) == date(2026, 1, 9)
+    assert calendar.finish_offset(4) == 5
+
+    # Round trip: date -> working-day offset
+    assert calendar.to_workday(date(2026, 1, 12)) == 4
+    assert calendar.workdays_before(7) == 4
+
+    # Vectorized lookups and on-demand horizon growth (far beyond 1 year)
+    offsets = calendar.start_offset(np.array([0, 4, 1000]))
+    assert list(offsets[:2]) == [0, 7]
+    assert calendar.start_date_of(1000).weekday() < 5
+
+    # Deadline: 10 working days of work vs a 12 calendar-day deadline (Jan 5 - Jan 16)
+    tasks = {
+        "T1": ConstructionTask(id="T1", name="Task 1", base_duration_per_sqyard=0.01, required_workers=1, cost_per_day=1, dependencies=[]),
+    }
+    project_input = ProjectInput(
+        area=1000, floors=1, deadline=12, budget=1000000, workforce_cap=20,
+        api_key="test", start_date=date(2026, 1, 5), holidays=[date(2026, 1, 7)]
+    )
+    schedule = {"T1": {"start": 0, "end": 10}}
+
+    # 10 working days (with the holiday) finish on Mon 19th -> 15 calendar days, 3 late
+    result = ConstraintEngine().check_feasibility(schedule, 0, project_input, tasks, calendar=calendar)
+    assert "Deadline exceeded by 3 days." in result["issues"]
+
+    simulation = RiskSimulator().run_simulation(list(tasks.values()), project_input, seed=1, calendar=calendar)
+    assert simulation.deadline_risk_probability > 50
+    assert simulation.p50_date >= date(2026, 1, 16)
+
+def test_work_calendar_concurrent_growth():
+    # Threads grow one small-horizon calendar while others read it
+    holidays = [date(2026, 1, 7), date(2027, 3, 1)]
+    expected = WorkCalendar(date(2026, 1, 5), holidays=holidays, horizon_days=4000)
+    workdays = np.arange(0, 2000)
+    for _ in range(20):
+        shared = WorkCalendar(date(2026, 1, 5), holidays=holidays, horizon_days=2)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda end: (shared.finish_offset(workdays[:end]), shared.workdays_before(end)),
+                range(10, 2000, 100)
+            ))
+        for end, (finish, before) in zip(range(10, 2000, 100), results):
+            assert np.array_equal(finish, expected.finish_offset(workdays[:end]))
+            assert before == expected.workdays_before(end)
+
+if __name__ == "__main__":
+    test_work_calendar()
+    test_work_calendar_concurrent_growth()